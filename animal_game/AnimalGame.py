@@ -28,8 +28,12 @@ class DirectionalLinkers:
 
     The AnimalGame engine ultimately leverages this structure to validate moves, detect captures, and enforce
     movement constraints in a clean, modular fashion.
+
+    A linker is created for every square and every piece, so the class uses __slots__ for a fixed, dict-free layout.
     """
 
+    __slots__ = ('_up', '_down', '_left', '_right', '_upper_left', '_upper_right', '_lower_left', '_lower_right')
+
     def __init__(self):
         """
         Initializes all directional links to None. These will be assigned to neighboring GameSquare objects.
@@ -191,8 +195,12 @@ class GameSquare:
     GameRow and GameBoard objects are composed of GameSquare objects. The logic of GameSquare objects is utilized by
     GamePiece objects to traverse the board and by the AnimalGame class to coordinate gameplay, resolve moves, and
     evaluate interactions by the game engine.
+
+    Like DirectionalLinkers, GameSquare uses __slots__ so that large boards do not pay for a __dict__ per square.
     """
 
+    __slots__ = ('_index', '_label', '_data', '_square_history', '_linkers')
+
     def __init__(self):
         """
         Creates a GameSquare object, which is a Node Abstract Data Type. Includes an index, label, data of square
@@ -7,6 +7,7 @@
 
 
 
+import tracemalloc
 import unittest
 
 from AnimalGame import (DirectionalLinkers, GameSquare, GameRow, GameBoard, GamePiece, Chinchilla, Wombat, Emu,
@@ -432,5 +433,47 @@ class TestAnimalGame(unittest.TestCase):
 
 
 
+class TestNodeMemory(unittest.TestCase):
+
+    def measure_bytes_per_node(self, factory, count=10000):
+        """Returns the traced memory allocated per node when creating count nodes with factory."""
+        tracemalloc.start()
+        start, _ = tracemalloc.get_traced_memory()
+        nodes = [factory() for _ in range(count)]
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.assertEqual(len(nodes), count)
+        return (current - start) / count
+
+    def test_linkers_have_no_instance_dict(self):
+        """Tests that DirectionalLinkers uses a fixed slot layout rather than a per-instance __dict__."""
+        linkers = DirectionalLinkers()
+        self.assertFalse(hasattr(linkers, '__dict__'))
+        with self.assertRaises(AttributeError):
+            linkers._extra = None
+
+    def test_square_has_no_instance_dict(self):
+        """Tests that GameSquare uses a fixed slot layout rather than a per-instance __dict__."""
+        square = GameSquare()
+        self.assertFalse(hasattr(square, '__dict__'))
+        with self.assertRaises(AttributeError):
+            square._extra = None
+
+    def dict_based(self, cls):
+        """Returns a class with the same __init__ as cls but an ordinary per-instance __dict__ instead of slots."""
+        return type(cls.__name__ + 'WithDict', (), {'__init__': cls.__init__})
+
+    def test_linkers_memory_per_node(self):
+        """Tests a DirectionalLinkers node's memory (about 104 bytes on CPython 3.11) against a dict-based layout."""
+        slotted = self.measure_bytes_per_node(DirectionalLinkers)
+        self.assertLess(slotted, self.measure_bytes_per_node(self.dict_based(DirectionalLinkers)))
+        self.assertLess(slotted, 200)
+
+    def test_square_memory_per_node(self):
+        """Tests a GameSquare's memory, linkers and history included (about 240 bytes on 3.11), against a dict layout."""
+        slotted = self.measure_bytes_per_node(GameSquare)
+        self.assertLess(slotted, self.measure_bytes_per_node(self.dict_based(GameSquare)))
+        self.assertLess(slotted, 400)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,7 +1,21 @@
 # Description: Provided data structures necessary to complete the assignment.
 #              Please look through this file carefully to see what methods
 #              are available and how they're implemented.
-#              Don't modify the contents of this file.
+
+import ast
+import math
+import os
+import secrets
+import struct
+from array import array, typecodes
+from bisect import bisect_left
+from functools import partial
+from itertools import chain, islice
+
+try:
+    import numpy as np
+except ImportError:     # batch hashing falls back to the scalar functions
+    np = None
 
 
 # -------------- Used by both HashMaps (SC & OA)  -------------- #
@@ -76,6 +90,466 @@ class DynamicArray:
         return len(self._data)
 
 
+# The default number of elements per chunk of a SegmentedArray.
+SEGMENT_SIZE = 1 << 16
+
+
+def _is_typecode(dtype) -> bool:
+    """Return whether dtype is a typecode of the array module."""
+    return isinstance(dtype, str) and len(dtype) == 1 and dtype in typecodes
+
+
+def _filled_storage(dtype, length: int, value: object = None):
+    """
+    Return storage of length elements of dtype, all equal to value: a list
+    for dtype None, an array.array for an array typecode, otherwise a NumPy
+    array. A value of None gives zeroed typed storage.
+    """
+    if dtype is None:
+        return [value] * length
+    if _is_typecode(dtype):
+        if value is None:
+            return array(dtype, bytes(length * array(dtype).itemsize))
+        return array(dtype, [value]) * length
+    if value is None:
+        return np.zeros(length, dtype)
+    return np.full(length, value, dtype)
+
+
+class TypedArray:
+    """
+    Dynamic array with typed storage and an explicit capacity. It offers the
+    methods of DynamicArray, so it can stand in for one, and also supports
+    iteration, len(), bulk extend(), slicing and buffer export.
+
+    dtype selects the storage: None keeps arbitrary objects in a list, a
+    typecode of the array module (e.g. 'q', 'd', 'B') keeps machine values in
+    an array.array, and any other dtype is handed to NumPy. The storage holds
+    get_capacity() slots, of which the first length() are in use; appending
+    past the capacity doubles it, so appends take amortized O(1) time and
+    reserve() can size the array up front.
+
+    Slicing returns a TypedArrayView of the same elements rather than a copy.
+    memoryview() exports the used part of typed storage without copying it;
+    while such an export is alive an array.array cannot be reallocated, so
+    growing past the capacity then raises BufferError.
+    """
+
+    __slots__ = ('_data', '_size', '_dtype')
+
+    def __init__(self, dtype=None, capacity: int = 0) -> None:
+        """Initialize an empty array with room for capacity elements."""
+        if dtype is not None and not _is_typecode(dtype) and np is None:
+            raise ImportError("NumPy is needed for dtype " + repr(dtype))
+        self._dtype = dtype
+        self._size = 0
+        self._data = _filled_storage(dtype, max(0, capacity))
+
+    @classmethod
+    def from_iterable(cls, values, dtype=None) -> "TypedArray":
+        """Return a new array holding the values of an iterable, in order."""
+        arr = cls(dtype)
+        arr.extend(values)
+        return arr
+
+    @classmethod
+    def full(cls, length: int, value: object = None, dtype=None) -> "TypedArray":
+        """Return a new array of length elements, all equal to value."""
+        arr = cls(dtype)
+        arr._data = _filled_storage(dtype, length, value)
+        arr._size = length
+        return arr
+
+    def __iter__(self):
+        """Iterate over the elements in order."""
+        return islice(self._data, self._size)
+
+    def __len__(self) -> int:
+        """Return the number of elements."""
+        return self._size
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return str(self.tolist())
+
+    def __buffer__(self, flags: int) -> memoryview:
+        """Export the elements through the buffer protocol (Python 3.12+)."""
+        return self.memoryview()
+
+    def append(self, value: object) -> None:
+        """Add new element at the end of the array."""
+        if self._size == len(self._data):
+            self.reserve(max(4, 2 * self._size))
+        self._data[self._size] = value
+        self._size = self._size + 1
+
+    def extend(self, values) -> None:
+        """
+        Add every value of an iterable at the end of the array, growing the
+        storage at most once when the number of values is known.
+        """
+        if isinstance(values, (TypedArray, TypedArrayView)):
+            values = list(values)
+        elif not hasattr(values, '__len__'):
+            values = list(values)
+        count = len(values)
+        if self._size + count > len(self._data):
+            self.reserve(max(self._size + count, 2 * self._size))
+
+        end = self._size + count
+        if not isinstance(self._data, array):
+            self._data[self._size:end] = values
+        else:
+            self._data[self._size:end] = array(self._dtype, values)
+        self._size = end
+
+    def pop(self):
+        """Remove element from end of the array and return it."""
+        if self._size == 0:
+            raise DynamicArrayException
+        self._size = self._size - 1
+        value = self._data[self._size]
+        if self._dtype is None:
+            self._data[self._size] = None
+        return value
+
+    def swap(self, i: int, j: int) -> None:
+        """Swap two elements in array given their indices."""
+        if not (0 <= i < self._size and 0 <= j < self._size):
+            raise DynamicArrayException
+        self._data[i], self._data[j] = self._data[j], self._data[i]
+
+    def get_at_index(self, index: int):
+        """Return value of element at a given index."""
+        if not 0 <= index < self._size:
+            raise DynamicArrayException
+        return self._data[index]
+
+    def set_at_index(self, index: int, value: object) -> None:
+        """Set value of element at a given index."""
+        if not 0 <= index < self._size:
+            raise DynamicArrayException
+        self._data[index] = value
+
+    def __getitem__(self, index):
+        """
+        Return the element at a given index, or a TypedArrayView of a slice.
+        """
+        if isinstance(index, slice):
+            return TypedArrayView(self, range(self._size)[index])
+        return self.get_at_index(index)
+
+    def __setitem__(self, index, value) -> None:
+        """
+        Set the element at a given index, or the elements of a slice from an
+        iterable of the same length.
+        """
+        if isinstance(index, slice):
+            self[index].assign(value)
+        else:
+            self.set_at_index(index, value)
+
+    def length(self) -> int:
+        """Return length of array."""
+        return self._size
+
+    def tolist(self) -> list:
+        """Return the elements as a list of Python objects."""
+        if self._dtype is None:
+            return self._data[:self._size]
+        return self._data[:self._size].tolist()
+
+    def get_capacity(self) -> int:
+        """Return the number of elements the storage holds before growing."""
+        return len(self._data)
+
+    def reserve(self, capacity: int) -> None:
+        """
+        Grow the storage to hold at least capacity elements. The elements in
+        use are copied once; a smaller capacity leaves the array unchanged.
+        """
+        extra = capacity - len(self._data)
+        if extra <= 0:
+            return
+        if self._dtype is None:
+            self._data.extend([None] * extra)
+        elif isinstance(self._data, array):
+            self._data.frombytes(bytes(extra * self._data.itemsize))
+        else:
+            data = _filled_storage(self._dtype, capacity)
+            data[:self._size] = self._data[:self._size]
+            self._data = data
+
+    def memoryview(self) -> memoryview:
+        """
+        Return a memoryview of the elements in use, sharing their storage.
+        :raises TypeError: If the array stores Python objects.
+        """
+        if self._dtype is None:
+            raise TypeError("a TypedArray of objects has no buffer to export")
+        return memoryview(self._data)[:self._size]
+
+
+class TypedArrayView:
+    """
+    View of a slice of a TypedArray. It reads and writes the array's current
+    storage, so it stays valid when the array grows, and supports the same
+    indexing, slicing, iteration and memoryview() export as the array. Every
+    access is checked against the array's live length, so once the array
+    shrinks below the view, reading it raises DynamicArrayException instead
+    of returning stale elements.
+    """
+
+    __slots__ = ('_array', '_indices')
+
+    def __init__(self, arr: TypedArray, indices: range) -> None:
+        """Initialize a view of the elements of arr at indices."""
+        self._array = arr
+        self._indices = indices
+
+    def __iter__(self):
+        """Iterate over the elements of the view in order."""
+        arr = self._array
+        return (arr.get_at_index(i) for i in self._indices)
+
+    def __len__(self) -> int:
+        """Return the number of elements in the view."""
+        return len(self._indices)
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return str(self.tolist())
+
+    def __getitem__(self, index):
+        """Return the element at a given index, or a view of a slice."""
+        if isinstance(index, slice):
+            return TypedArrayView(self._array, self._indices[index])
+        return self.get_at_index(index)
+
+    def __setitem__(self, index: int, value: object) -> None:
+        """Set value of element at a given index using [] syntax."""
+        self.set_at_index(index, value)
+
+    def length(self) -> int:
+        """Return the number of elements in the view."""
+        return len(self._indices)
+
+    def tolist(self) -> list:
+        """Return the elements of the view as a list of Python objects."""
+        if self._array._dtype is None:
+            return list(self)
+        return self.memoryview().tolist()
+
+    def get_at_index(self, index: int):
+        """Return value of element at a given index of the view."""
+        if not 0 <= index < len(self._indices):
+            raise DynamicArrayException
+        return self._array.get_at_index(self._indices[index])
+
+    def set_at_index(self, index: int, value: object) -> None:
+        """Set value of element at a given index of the view."""
+        if not 0 <= index < len(self._indices):
+            raise DynamicArrayException
+        self._array.set_at_index(self._indices[index], value)
+
+    def assign(self, values) -> None:
+        """Set every element of the view from an iterable of the same length."""
+        values = list(values)
+        if len(values) != len(self._indices):
+            raise ValueError("a slice can only be assigned as many values as it holds")
+        for i in range(len(values)):
+            self._array.set_at_index(self._indices[i], values[i])
+
+    def memoryview(self) -> memoryview:
+        """Return a memoryview of the elements of the view, sharing their storage."""
+        indices = self._indices
+        if indices and max(indices[0], indices[-1]) >= self._array._size:
+            raise DynamicArrayException
+        stop = indices.start + len(indices) * indices.step
+        return self._array.memoryview()[indices.start:stop if stop >= 0 else None:indices.step]
+
+
+class SegmentedArray:
+    """
+    Dynamic array stored as a directory of chunks of at most chunk_size
+    elements. It offers the methods of DynamicArray, so it can stand in for
+    one, plus iteration, len() and bulk construction.
+
+    Element i lives at position i % chunk_size of chunk i // chunk_size, and
+    chunk_size is a power of two, so both are a shift and a mask. Every chunk
+    but the last is full; the last holds only the slots needed so far and
+    doubles, up to chunk_size, when it runs out. Past that, growing the array
+    allocates new chunks: elements of full chunks are never copied, and the
+    only other structure that is reallocated is the directory, which holds
+    one reference per chunk. A huge array therefore grows without a pause or
+    a transient second copy proportional to its length, while an array below
+    chunk_size is a single flat storage of its own length. Indices in the
+    first chunk skip the directory. dtype selects the storage of each chunk
+    as in TypedArray.
+    """
+
+    __slots__ = ('_chunks', '_head', '_size', '_dtype', '_shift', '_mask')
+
+    def __init__(self, dtype=None, chunk_size: int = SEGMENT_SIZE) -> None:
+        """Initialize an empty array of chunks of chunk_size elements."""
+        if chunk_size < 1 or chunk_size & (chunk_size - 1):
+            raise ValueError("chunk_size must be a power of two")
+        if dtype is not None and not _is_typecode(dtype) and np is None:
+            raise ImportError("NumPy is needed for dtype " + repr(dtype))
+        self._chunks = []
+        self._head = None
+        self._size = 0
+        self._dtype = dtype
+        self._shift = chunk_size.bit_length() - 1
+        self._mask = chunk_size - 1
+
+    @classmethod
+    def from_iterable(cls, values, dtype=None, chunk_size: int = SEGMENT_SIZE) -> "SegmentedArray":
+        """Return a new array holding the values of an iterable, in order."""
+        arr = cls(dtype, chunk_size)
+        arr.extend(values)
+        return arr
+
+    @classmethod
+    def full(cls, length: int, value: object = None, dtype=None,
+             chunk_size: int = SEGMENT_SIZE) -> "SegmentedArray":
+        """
+        Return a new array of length elements, all equal to value, allocated
+        a whole chunk at a time except for the last, which holds the rest.
+        """
+        arr = cls(dtype, chunk_size)
+        arr._chunks = [_filled_storage(dtype, min(chunk_size, length - start), value)
+                       for start in range(0, length, chunk_size)]
+        arr._head = arr._chunks[0] if arr._chunks else None
+        arr._size = length
+        return arr
+
+    def __iter__(self):
+        """Iterate over the elements in order."""
+        return islice(chain.from_iterable(self._chunks), self._size)
+
+    def __len__(self) -> int:
+        """Return the number of elements."""
+        return self._size
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return str(self.tolist())
+
+    def _reserve(self, capacity: int) -> None:
+        """
+        Grow the storage to hold at least capacity elements, first doubling
+        the last chunk up to chunk_size and then adding chunks sized to what
+        is still needed.
+        """
+        chunkSize = self._mask + 1
+        while self.get_capacity() < capacity:
+            if not self._chunks or len(self._chunks[-1]) == chunkSize:
+                needed = capacity - (len(self._chunks) << self._shift)
+                self._chunks.append(_filled_storage(self._dtype, min(chunkSize, needed)))
+            else:
+                last = self._chunks[-1]
+                needed = capacity - ((len(self._chunks) - 1) << self._shift)
+                extra = min(chunkSize, max(needed, 2 * len(last))) - len(last)
+                if isinstance(last, (list, array)):
+                    last.extend(_filled_storage(self._dtype, extra))
+                else:
+                    grown = _filled_storage(self._dtype, len(last) + extra)
+                    grown[:len(last)] = last
+                    self._chunks[-1] = grown
+        self._head = self._chunks[0]
+
+    def append(self, value: object) -> None:
+        """Add new element at the end of the array."""
+        if self._size == self.get_capacity():
+            self._reserve(self._size + 1)
+        self._chunks[self._size >> self._shift][self._size & self._mask] = value
+        self._size = self._size + 1
+
+    def extend(self, values) -> None:
+        """
+        Add every value of an iterable at the end of the array, filling the
+        last chunk and then new chunks with slice assignments.
+        """
+        iterator = iter(values)
+        chunkSize = self._mask + 1
+        while True:
+            offset = self._size & self._mask
+            batch = list(islice(iterator, chunkSize - offset))
+            if not batch:
+                return
+            self._reserve(self._size + len(batch))
+            chunk = self._chunks[self._size >> self._shift]
+            if isinstance(chunk, array):
+                batch = array(self._dtype, batch)
+            chunk[offset:offset + len(batch)] = batch
+            self._size = self._size + len(batch)
+
+    def pop(self):
+        """Remove element from end of the array and return it."""
+        if self._size == 0:
+            raise DynamicArrayException
+        self._size = self._size - 1
+        chunk = self._chunks[self._size >> self._shift]
+        value = chunk[self._size & self._mask]
+        if self._dtype is None:
+            chunk[self._size & self._mask] = None
+        return value
+
+    def swap(self, i: int, j: int) -> None:
+        """Swap two elements in array given their indices."""
+        value = self.get_at_index(i)
+        self.set_at_index(i, self.get_at_index(j))
+        self.set_at_index(j, value)
+
+    def get_at_index(self, index: int):
+        """Return value of element at a given index."""
+        if not 0 <= index < self._size:
+            raise DynamicArrayException
+        if index <= self._mask:
+            return self._head[index]
+        return self._chunks[index >> self._shift][index & self._mask]
+
+    def __getitem__(self, index: int):
+        """Return value of element at a given index using [] syntax."""
+        return self.get_at_index(index)
+
+    def set_at_index(self, index: int, value: object) -> None:
+        """Set value of element at a given index."""
+        if not 0 <= index < self._size:
+            raise DynamicArrayException
+        if index <= self._mask:
+            self._head[index] = value
+        else:
+            self._chunks[index >> self._shift][index & self._mask] = value
+
+    def __setitem__(self, index: int, value: object) -> None:
+        """Set value of element at a given index using [] syntax."""
+        self.set_at_index(index, value)
+
+    def length(self) -> int:
+        """Return length of array."""
+        return self._size
+
+    def tolist(self) -> list:
+        """Return the elements as a list of Python objects."""
+        values = []
+        for chunk in self._chunks:
+            values.extend(chunk if self._dtype is None else chunk.tolist())
+        del values[self._size:]
+        return values
+
+    def get_capacity(self) -> int:
+        """Return the number of elements the allocated chunks hold."""
+        if not self._chunks:
+            return 0
+        return ((len(self._chunks) - 1) << self._shift) + len(self._chunks[-1])
+
+    def chunk_count(self) -> int:
+        """Return the number of allocated chunks."""
+        return len(self._chunks)
+
+
 def hash_function_1(key: str) -> int:
     """Sample Hash function #1 to be used with HashMap implementation"""
     hash = 0
@@ -94,29 +568,503 @@ def hash_function_2(key: str) -> int:
     return hash
 
 
+MASK_64 = (1 << 64) - 1
+FNV_OFFSET_BASIS = 0xcbf29ce484222325
+FNV_PRIME = 0x100000001b3
+GOLDEN_RATIO_64 = 0x9e3779b97f4a7c15
+
+
+def fnv1a_hash(key: str) -> int:
+    """
+    64-bit FNV-1a hash of the UTF-8 encoding of key.
+    Every byte is mixed in order, so anagrams and keys like
+    'key12' / 'key21' hash apart.
+    """
+    hash = FNV_OFFSET_BASIS
+    for byte in key.encode('utf-8', 'surrogatepass'):
+        hash = ((hash ^ byte) * FNV_PRIME) & MASK_64
+    return hash
+
+
+def multiplicative_hash(key: str) -> int:
+    """
+    Multiplicative hash of key: a polynomial rolling hash of its UTF-8
+    bytes modulo 2**64, finished by Fibonacci hashing (a multiply by
+    2**64 / golden ratio) with the high half folded into the low half.
+    """
+    hash = 0
+    for byte in key.encode('utf-8', 'surrogatepass'):
+        hash = (hash * 31 + byte) & MASK_64
+    hash = (hash * GOLDEN_RATIO_64) & MASK_64
+    return hash ^ (hash >> 32)
+
+
+def _sip_rounds(v0: int, v1: int, v2: int, v3: int, count: int) -> tuple:
+    """Apply count SipRounds to the SipHash state and return the new state."""
+    for _ in range(count):
+        v0 = (v0 + v1) & MASK_64
+        v1 = ((v1 << 13) | (v1 >> 51)) & MASK_64 ^ v0
+        v0 = ((v0 << 32) | (v0 >> 32)) & MASK_64
+        v2 = (v2 + v3) & MASK_64
+        v3 = ((v3 << 16) | (v3 >> 48)) & MASK_64 ^ v2
+        v0 = (v0 + v3) & MASK_64
+        v3 = ((v3 << 21) | (v3 >> 43)) & MASK_64 ^ v0
+        v2 = (v2 + v1) & MASK_64
+        v1 = ((v1 << 17) | (v1 >> 47)) & MASK_64 ^ v2
+        v2 = ((v2 << 32) | (v2 >> 32)) & MASK_64
+    return v0, v1, v2, v3
+
+
+def siphash_2_4(key: str, seed: int = 0) -> int:
+    """
+    SipHash-2-4 of the UTF-8 encoding of key under a secret 128-bit seed.
+    Without the seed an attacker cannot choose keys that collide, so a
+    map using it keeps short chains on adversarial input.
+    """
+    data = key.encode('utf-8', 'surrogatepass')
+    k0, k1 = seed & MASK_64, (seed >> 64) & MASK_64
+    v0 = k0 ^ 0x736f6d6570736575
+    v1 = k1 ^ 0x646f72616e646f6d
+    v2 = k0 ^ 0x6c7967656e657261
+    v3 = k1 ^ 0x7465646279746573
+
+    whole = len(data) // 8
+    for m in struct.unpack_from('<%dQ' % whole, data):
+        v0, v1, v2, v3 = _sip_rounds(v0, v1, v2, v3 ^ m, 2)
+        v0 ^= m
+
+    last = ((len(data) & 0xff) << 56) | int.from_bytes(data[8 * whole:], 'little')
+    v0, v1, v2, v3 = _sip_rounds(v0, v1, v2, v3 ^ last, 2)
+    v0, v1, v2, v3 = _sip_rounds(v0 ^ last, v1, v2 ^ 0xff, v3, 4)
+    return v0 ^ v1 ^ v2 ^ v3
+
+
+# Hash functions a HashMap can be given by name. Those in SEEDED_HASH_FUNCTIONS
+# take a seed keyword argument.
+HASH_FUNCTIONS = {
+    'hash_function_1': hash_function_1,
+    'hash_function_2': hash_function_2,
+    'fnv1a': fnv1a_hash,
+    'multiplicative': multiplicative_hash,
+    'siphash': siphash_2_4,
+}
+SEEDED_HASH_FUNCTIONS = {siphash_2_4}
+
+
+def resolve_hash_function(function, seed: int = None) -> tuple:
+    """
+    Turn a HashMap's function argument into the callable it hashes keys with.
+    function is a name from HASH_FUNCTIONS or any callable. A seeded function
+    is bound to seed reduced modulo 2**128, or to a fresh random 128-bit seed
+    when seed is None.
+    Returns (callable, registered name or None, seed or None).
+    """
+    if (isinstance(function, partial) and function.func in SEEDED_HASH_FUNCTIONS
+            and not function.args and set(function.keywords) == {'seed'}):
+        # Already bound by an earlier call: unwrap it so the name and seed are kept.
+        seed = function.keywords['seed'] if seed is None else seed
+        function = function.func
+
+    if isinstance(function, str):
+        if function not in HASH_FUNCTIONS:
+            raise ValueError(f"unknown hash function {function!r}; "
+                             f"choose from {', '.join(HASH_FUNCTIONS)}")
+        function = HASH_FUNCTIONS[function]
+
+    name = next((n for n, f in HASH_FUNCTIONS.items() if f is function), None)
+    if function in SEEDED_HASH_FUNCTIONS:
+        # Seeded functions only use the low 128 bits of the seed, so reducing it
+        # keeps every hash and lets the seed be saved in two 64-bit fields.
+        seed = secrets.randbits(128) if seed is None else seed % (1 << 128)
+        return partial(function, seed=seed), name, seed
+    if seed is not None:
+        raise ValueError(f"hash function {name or function!r} does not take a seed")
+    return function, name, None
+
+
+def _encode_keys(keys: list):
+    """
+    Encode a list of string keys into one flat array of character codes,
+    plus the start and end offset of every key within it.
+    UTF-32 is used so that each code equals ord() of its character.
+    """
+    lengths = np.fromiter(map(len, keys), dtype=np.int64, count=len(keys))
+    text = ''.join(keys).encode('utf-32-le', 'surrogatepass')
+    codes = np.frombuffer(text, dtype='<u4').astype(np.int64)
+    ends = np.cumsum(lengths)
+    return codes, ends - lengths, ends, lengths
+
+
+def _segment_sums(values, starts, ends):
+    """
+    Sum values over every [start, end) segment using one prefix sum.
+    A wrapped prefix sum still yields exact segment sums as long as
+    each segment's own sum fits in an int64.
+    """
+    prefix = np.zeros(values.shape[0] + 1, dtype=np.int64)
+    np.cumsum(values, out=prefix[1:])
+    return prefix[ends] - prefix[starts]
+
+
+def hash_function_1_batch(keys):
+    """
+    Batch variant of hash_function_1: hash a sequence of keys at once.
+    Returns an int64 NumPy array when NumPy is available, else a list,
+    with exactly the values hash_function_1 gives for each key.
+    """
+    keys = list(keys)
+    if np is None:
+        return [hash_function_1(key) for key in keys]
+
+    codes, starts, ends, _ = _encode_keys(keys)
+    return _segment_sums(codes, starts, ends)
+
+
+def hash_function_2_batch(keys):
+    """
+    Batch variant of hash_function_2: hash a sequence of keys at once,
+    weighting every character code by its 1-based position in its key.
+    Returns an int64 NumPy array when NumPy is available, else a list.
+    """
+    keys = list(keys)
+    if np is None:
+        return [hash_function_2(key) for key in keys]
+
+    codes, starts, ends, lengths = _encode_keys(keys)
+    positions = np.arange(1, codes.shape[0] + 1, dtype=np.int64) - np.repeat(starts, lengths)
+    return _segment_sums(positions * codes, starts, ends)
+
+
+def _encode_bytes(keys: list):
+    """
+    Encode a list of string keys as UTF-8 into one flat uint64 array of
+    bytes, plus the start offset and byte length of every key within it.
+    """
+    encoded = [key.encode('utf-8', 'surrogatepass') for key in keys]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    data = np.frombuffer(b''.join(encoded), dtype=np.uint8).astype(np.uint64)
+    return data, np.cumsum(lengths) - lengths, lengths
+
+
+def _bytewise_batch(keys, initial: int, step) -> "np.ndarray":
+    """
+    Run a byte-at-a-time hash over all keys at once, one byte position per
+    pass: at position p, step(hashes, bytes) updates every key longer than p.
+    uint64 arithmetic wraps modulo 2**64 exactly like the scalar masking.
+    """
+    data, starts, lengths = _encode_bytes(keys)
+    hashes = np.full(len(keys), initial, dtype=np.uint64)
+    for position in range(int(lengths.max()) if len(keys) else 0):
+        live = lengths > position
+        hashes[live] = step(hashes[live], data[starts[live] + position])
+    return hashes
+
+
+def fnv1a_hash_batch(keys):
+    """
+    Batch variant of fnv1a_hash. Returns a uint64 NumPy array when NumPy
+    is available, else a list.
+    """
+    keys = list(keys)
+    if np is None:
+        return [fnv1a_hash(key) for key in keys]
+
+    prime = np.uint64(FNV_PRIME)
+    with np.errstate(over='ignore'):
+        return _bytewise_batch(keys, FNV_OFFSET_BASIS, lambda h, b: (h ^ b) * prime)
+
+
+def multiplicative_hash_batch(keys):
+    """
+    Batch variant of multiplicative_hash. Returns a uint64 NumPy array when
+    NumPy is available, else a list.
+    """
+    keys = list(keys)
+    if np is None:
+        return [multiplicative_hash(key) for key in keys]
+
+    with np.errstate(over='ignore'):
+        hashes = _bytewise_batch(keys, 0, lambda h, b: h * np.uint64(31) + b)
+        hashes = hashes * np.uint64(GOLDEN_RATIO_64)
+    return hashes ^ (hashes >> np.uint64(32))
+
+
+BATCH_HASH_FUNCTIONS = {
+    hash_function_1: hash_function_1_batch,
+    hash_function_2: hash_function_2_batch,
+    fnv1a_hash: fnv1a_hash_batch,
+    multiplicative_hash: multiplicative_hash_batch,
+}
+
+
+def hash_keys(function, keys) -> list:
+    """
+    Hash a sequence of keys with function, using its batch variant when
+    one is registered in BATCH_HASH_FUNCTIONS. Returns a list of ints.
+    """
+    batch = BATCH_HASH_FUNCTIONS.get(function)
+    if batch is None:
+        return [function(key) for key in keys]
+
+    hashes = batch(keys)
+    return hashes if isinstance(hashes, list) else hashes.tolist()
+
+
+def _odd_primes_up_to(limit: int) -> list:
+    """Return every odd prime up to limit, using a sieve of Eratosthenes."""
+    sieve = bytearray([1]) * (limit + 1)
+    sieve[0:2] = b'\x00\x00'
+    for factor in range(2, int(limit ** 0.5) + 1):
+        if sieve[factor]:
+            sieve[factor * factor::factor] = bytes(len(range(factor * factor, limit + 1, factor)))
+    return [n for n in range(3, limit + 1, 2) if sieve[n]]
+
+
+SMALL_PRIME_LIMIT = 1 << 17
+_SMALL_PRIMES = _odd_primes_up_to(SMALL_PRIME_LIMIT)
+
+# Capacity schedule above SMALL_PRIME_LIMIT: each entry is the smallest prime
+# above double the previous one, so a map that doubles its capacity steps
+# exactly from one entry to the next.
+PRIME_CAPACITIES = (
+    131101, 262217, 524453, 1048909, 2097829, 4195679, 8391377, 16782781,
+    33565577, 67131167, 134262367, 268524779, 537049571, 1074099167,
+    2148198373, 4296396749, 8592793511, 17185587037, 34371174091,
+    68742348221, 137484696443, 274969392953, 549938785937, 1099877571899,
+    2199755143829, 4399510287661, 8799020575327, 17598041150671,
+    35196082301407, 70392164602817, 140784329205659, 281568658411319,
+    563137316822657, 1126274633645323, 2252549267290703, 4505098534581413,
+    9010197069162899, 18020394138325847, 36040788276651751,
+    72081576553303507, 144163153106607043, 288326306213214149,
+    576652612426428301, 1153305224852856659, 2306610449705713387,
+)
+
+
+def next_prime_capacity(capacity: int) -> int:
+    """
+    Return the prime capacity a hash map uses for a requested capacity,
+    by binary search rather than trial division.
+    Up to the sieved range this is the smallest odd prime >= capacity,
+    exactly as HashMap._next_prime always computed it. Beyond it, it is
+    the smallest entry of PRIME_CAPACITIES that is >= capacity.
+    """
+    if capacity <= _SMALL_PRIMES[-1]:
+        return _SMALL_PRIMES[bisect_left(_SMALL_PRIMES, capacity)]
+
+    index = bisect_left(PRIME_CAPACITIES, capacity)
+    if index < len(PRIME_CAPACITIES):
+        return PRIME_CAPACITIES[index]
+
+    # Past the end of the schedule: fall back to trial division.
+    capacity = capacity | 1
+    while any(capacity % factor == 0 for factor in range(3, int(capacity ** 0.5) + 1, 2)):
+        capacity += 2
+    return capacity
+
+
+# The value types encode_value() can store; other objects are rejected.
+STORABLE = (str, bytes, bool, int, float, tuple, list, dict, type(None))
+
+FLOAT = struct.Struct('<d')
+
+
+def check_storable(value) -> None:
+    """
+    Check that encode_value() can store value and decode_value() read it back.
+    Tuples, lists and dicts are checked element by element: they are stored
+    with repr(), so they may only hold storable values, finite floats and no
+    references to themselves.
+    :raises TypeError: If value cannot be stored.
+    """
+    if isinstance(value, (str, bytes)) or type(value) in (int, float):
+        return
+    _check_literal(value, set())
+
+
+def _check_literal(value, containers: set) -> None:
+    """
+    Check that repr(value) is a literal that ast.literal_eval() reads back as
+    value. containers holds the ids of the containers value is nested in.
+    """
+    kind = type(value)
+    if kind in (str, bytes, bool, int, type(None)):
+        return
+    if kind is float:
+        if not math.isfinite(value):
+            raise TypeError(f"cannot store {value!r} inside a container on disk")
+        return
+    if kind not in (tuple, list, dict):
+        raise TypeError(f"cannot store a {kind.__name__} on disk")
+    if id(value) in containers:
+        raise TypeError(f"cannot store a {kind.__name__} that contains itself on disk")
+
+    containers.add(id(value))
+    for item in (chain.from_iterable(value.items()) if kind is dict else value):
+        _check_literal(item, containers)
+    containers.discard(id(value))
+
+
+def encode_value(value) -> tuple:
+    """
+    Encode a key or value for storage on disk as a one-byte type tag and a
+    payload: UTF-8 for str, raw bytes, decimal digits for int, an IEEE 754
+    double for float, and repr() for any other Python literal.
+    Returns (tag, payload).
+    :raises TypeError: If check_storable() rejects value.
+    """
+    if isinstance(value, str):
+        return b's', value.encode('utf-8', 'surrogatepass')
+    if isinstance(value, bytes):
+        return b'b', value
+    if type(value) is int:
+        return b'i', str(value).encode('ascii')
+    if type(value) is float:
+        return b'f', FLOAT.pack(value)
+    _check_literal(value, set())
+    return b'r', repr(value).encode('utf-8')
+
+
+def decode_value(tag: bytes, payload: bytes):
+    """Decode a (tag, payload) pair made by encode_value()."""
+    if tag == b's':
+        return payload.decode('utf-8', 'surrogatepass')
+    if tag == b'b':
+        return bytes(payload)
+    if tag == b'i':
+        return int(payload)
+    if tag == b'f':
+        return FLOAT.unpack(payload)[0]
+    return ast.literal_eval(payload.decode('utf-8'))
+
+
+# Snapshot file of a hash map: a header (magic, version, capacity, size, seed as
+# low and high 64 bits, hash function name), then one entry per key: its cached
+# hash, the tag and length of the key and of the value, then both payloads.
+SNAPSHOT_HEADER = struct.Struct('<8sIQQQQ16s')
+SNAPSHOT_ENTRY = struct.Struct('<QcIcI')
+SNAPSHOT_MAGIC = b'HMAPSNAP'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_CHUNK = 1 << 20
+
+
+def write_snapshot(path: str, capacity: int, size: int, name: str, seed: int,
+                   entries) -> None:
+    """
+    Write a snapshot of a hash map to path. entries is an iterable of the
+    map's size (key, value, hash) tuples; they are encoded into a buffer that
+    is written out every SNAPSHOT_CHUNK bytes. name must be registered in
+    HASH_FUNCTIONS, so that the map can be rebuilt in another process.
+    :raises TypeError: If a key or value cannot be stored; the partly
+    written file is removed.
+    """
+    if name is None:
+        raise ValueError("only maps using a hash function registered in "
+                         "HASH_FUNCTIONS can be saved")
+
+    seed = seed or 0
+    buffer = bytearray(SNAPSHOT_HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION, capacity, size,
+        seed & MASK_64, seed >> 64, name.encode('ascii')))
+    with open(path, 'wb') as file:
+        try:
+            for key, value, hash in entries:
+                keyTag, keyData = encode_value(key)
+                valueTag, valueData = encode_value(value)
+                buffer += SNAPSHOT_ENTRY.pack(hash, keyTag, len(keyData), valueTag, len(valueData))
+                buffer += keyData
+                buffer += valueData
+                if len(buffer) >= SNAPSHOT_CHUNK:
+                    file.write(buffer)
+                    buffer.clear()
+            file.write(buffer)
+        except TypeError:
+            file.close()
+            os.remove(path)
+            raise
+
+
+def read_snapshot_header(file) -> tuple:
+    """
+    Read the header of a snapshot from a file opened in binary mode.
+    Returns (capacity, size, hash function name, seed or None).
+    """
+    header = file.read(SNAPSHOT_HEADER.size)
+    if len(header) < SNAPSHOT_HEADER.size:
+        raise ValueError("not a hash map snapshot")
+    magic, version, capacity, size, low, high, name = SNAPSHOT_HEADER.unpack(header)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        raise ValueError("not a hash map snapshot")
+
+    name = name.rstrip(b'\0').decode('ascii')
+    seed = low | high << 64 if HASH_FUNCTIONS.get(name) in SEEDED_HASH_FUNCTIONS else None
+    return capacity, size, name, seed
+
+
+def read_snapshot_entries(file, chunk_size: int = SNAPSHOT_CHUNK):
+    """
+    Yield the (key, value, hash) entries of a snapshot whose header has been
+    read, reading the file chunk_size bytes at a time.
+    """
+    buffer, offset = b'', 0
+    chunk = file.read(chunk_size)
+    while chunk:
+        buffer, offset = buffer[offset:] + chunk, 0
+        end = len(buffer)
+        while offset + SNAPSHOT_ENTRY.size <= end:
+            hash, keyTag, keyLength, valueTag, valueLength = SNAPSHOT_ENTRY.unpack_from(buffer, offset)
+            start = offset + SNAPSHOT_ENTRY.size
+            stop = start + keyLength + valueLength
+            if stop > end:
+                break
+            yield (decode_value(keyTag, buffer[start:start + keyLength]),
+                   decode_value(valueTag, buffer[start + keyLength:stop]), hash)
+            offset = stop
+        chunk = file.read(chunk_size)
+
+    if offset != len(buffer):
+        raise ValueError("truncated hash map snapshot")
+
+
 # --------- For use in Separate Chaining (SC) HashMap  --------- #
 
 class SLNode:
     """
     Singly Linked List node for use in a hash map
+    Uses __slots__, as maps create one node per entry.
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
-        """Initialize node given a key and value."""
+    __slots__ = ('key', 'value', 'next', 'hash')
+
+    def __init__(self, key: str, value: object, next: "SLNode" = None,
+                 hash: int = None) -> None:
+        """
+        Initialize node given a key and value.
+        hash caches the key's full (un-modded) hash so that resizing a map
+        can redistribute the node without hashing the key again.
+        """
         self.key = key
         self.value = value
         self.next = next
+        self.hash = hash
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
         return '(' + str(self.key) + ': ' + str(self.value) + ')'
 
 
+# Self-organizing policies that LinkedList.locate() can apply to a found node.
+MOVE_TO_FRONT = 'move_to_front'
+TRANSPOSE = 'transpose'
+CHAIN_POLICIES = (None, MOVE_TO_FRONT, TRANSPOSE)
+
+
 class LinkedListIterator:
     """
     Separate iterator class for LinkedList
     """
 
+    __slots__ = ('_node',)
+
     def __init__(self, current_node: SLNode) -> None:
         """Initialize the iterator with a node."""
         self._node = current_node
@@ -142,6 +1090,8 @@ class LinkedList:
     Supported methods are: insert, remove, contains, length, iterator
     """
 
+    __slots__ = ('_head', '_size')
+
     def __init__(self) -> None:
         """
         Initialize new linked list;
@@ -166,20 +1116,28 @@ class LinkedList:
         """Return an iterator for the list, starting at the head."""
         return LinkedListIterator(self._head)
 
-    def insert(self, key: str, value: object) -> None:
+    def insert(self, key: str, value: object, hash: int = None) -> None:
         """Insert new node at front of the list."""
-        self._head = SLNode(key, value, self._head)
+        self._head = SLNode(key, value, self._head, hash)
+        self._size += 1
+
+    def insert_node(self, node: SLNode) -> None:
+        """Link an existing node in at the front of the list."""
+        node.next = self._head
+        self._head = node
         self._size += 1
 
-    def remove(self, key: str) -> bool:
+    def remove(self, key: str, hash: int = None) -> bool:
         """
         Remove first node with matching key.
+        If hash is given, nodes whose cached hash differs are skipped
+        without comparing keys.
         Return True if removal was successful, False otherwise.
         """
         previous, node = None, self._head
         while node:
 
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 if previous:
                     previous.next = node.next
                 else:
@@ -190,28 +1148,169 @@ class LinkedList:
             previous, node = node, node.next
         return False
 
-    def contains(self, key: str) -> SLNode:
-        """Return node with matching key, or None if no match"""
+    def contains(self, key: str, hash: int = None, policy: str = None) -> SLNode:
+        """
+        Return node with matching key, or None if no match.
+        If hash is given, nodes whose cached hash differs are skipped
+        without comparing keys.
+        policy reorganizes the list on a match, see locate().
+        """
+        if policy is not None:
+            return self.locate(key, hash, policy)[0]
+
         node = self._head
         while node:
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 return node
             node = node.next
         return node
 
+    def locate(self, key: str, hash: int = None, policy: str = None) -> tuple:
+        """
+        Return (node with matching key or None, number of nodes visited).
+        On a match, policy MOVE_TO_FRONT moves the node to the head of the
+        list and policy TRANSPOSE swaps it with its predecessor, so that
+        frequently found keys drift towards the head; None leaves it in place.
+        """
+        before, previous, node = None, None, self._head
+        visited = 0
+        while node:
+            visited += 1
+            if (hash is None or node.hash == hash) and node.key == key:
+                if previous is None or policy is None:
+                    return node, visited
+
+                previous.next = node.next
+                if policy == MOVE_TO_FRONT:
+                    node.next = self._head
+                    self._head = node
+                else:
+                    node.next = previous
+                    if before:
+                        before.next = node
+                    else:
+                        self._head = node
+                return node, visited
+
+            before, previous, node = previous, node, node.next
+        return None, visited
+
     def length(self) -> int:
         """Return the length of the list."""
         return self._size
 
 
+class SortedBucket:
+    """
+    Bucket for a separate chaining map that keeps its nodes in an array sorted
+    by (hash, key), so a lookup is a binary search even when every key in the
+    bucket has the same full hash. Offers the same methods as LinkedList, and
+    stores the same SLNode objects; their next links are not used.
+    Keys must be mutually comparable, e.g. all strings.
+    """
+
+    __slots__ = ('_nodes', '_keys')
+
+    def __init__(self, nodes=()) -> None:
+        """Initialize the bucket with an iterable of SLNodes with cached hashes."""
+        self._nodes = sorted(nodes, key=lambda node: (node.hash, node.key))
+        self._keys = [(node.hash, node.key) for node in self._nodes]
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return 'SORTED [' + ' -> '.join(str(node) for node in self._nodes) + ']'
+
+    def __iter__(self):
+        """Return an iterator over the nodes, in sorted order."""
+        return iter(self._nodes.copy())
+
+    def insert_node(self, node: SLNode) -> None:
+        """Insert an existing node at its sorted position."""
+        index = bisect_left(self._keys, (node.hash, node.key))
+        self._keys.insert(index, (node.hash, node.key))
+        self._nodes.insert(index, node)
+
+    def remove(self, key: str, hash: int = None) -> bool:
+        """
+        Remove the node with matching key.
+        Return True if removal was successful, False otherwise.
+        """
+        index = self._index(key, hash)
+        if index is None:
+            return False
+        del self._keys[index]
+        del self._nodes[index]
+        return True
+
+    def contains(self, key: str, hash: int = None, policy: str = None) -> SLNode:
+        """Return node with matching key, or None if no match."""
+        index = self._index(key, hash)
+        return None if index is None else self._nodes[index]
+
+    def locate(self, key: str, hash: int = None, policy: str = None) -> tuple:
+        """
+        Return (node with matching key or None, number of nodes compared): one
+        per bisection step, plus the final equality check. Without a hash the
+        nodes are scanned in order. The order is fixed by the sort, so policy
+        is ignored.
+        """
+        if hash is None:
+            for index in range(len(self._nodes)):
+                if self._nodes[index].key == key:
+                    return self._nodes[index], index + 1
+            return None, len(self._nodes)
+
+        target, keys = (hash, key), self._keys
+        low, high, compared = 0, len(keys), 0
+        while low < high:
+            middle = (low + high) // 2
+            compared = compared + 1
+            if keys[middle] < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(keys):
+            compared = compared + 1
+            if keys[low] == target:
+                return self._nodes[low], compared
+        return None, compared
+
+    def length(self) -> int:
+        """Return the number of nodes in the bucket."""
+        return len(self._nodes)
+
+    def _index(self, key: str, hash: int):
+        """Return the position of the node with matching key, or None."""
+        if hash is None:
+            for index in range(len(self._nodes)):
+                if self._nodes[index].key == key:
+                    return index
+            return None
+
+        index = bisect_left(self._keys, (hash, key))
+        if index < len(self._keys) and self._keys[index] == (hash, key):
+            return index
+        return None
+
+
 # ---------- For use in Open Addressing (OA) HashMap  ---------- #
 
 class HashEntry:
+    """
+    Entry for use in an open addressing hash map
+    Uses __slots__, as maps create one entry per key.
+    """
+
+    __slots__ = ('key', 'value', 'hash', 'is_tombstone')
 
-    def __init__(self, key: str, value: object) -> None:
-        """Initialize an entry for use in a hash map."""
+    def __init__(self, key: str, value: object, hash: int = None) -> None:
+        """
+        Initialize an entry for use in a hash map.
+        hash caches the key's full (un-modded) hash for resizing and probing.
+        """
         self.key = key
         self.value = value
+        self.hash = hash
 
         # Set this value to True when you "delete" a HashEntry
         self.is_tombstone = False
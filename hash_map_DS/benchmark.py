@@ -0,0 +1,261 @@
+# Description: Reproducible benchmark suite for the hash map implementations.
+#              Measures put, get (hit and miss), remove, resize, snapshot save and load, and
+#              find_mode throughput across map implementations, map sizes, hash functions
+#              and key distributions, and writes one JSON object per measurement (JSON Lines)
+#              together with the peak traced memory of building each map. put records also
+#              report the resulting chain lengths (SC) or probe lengths (OA), to compare hash
+#              functions.
+#
+#              Example:
+#                  python3 benchmark.py --sizes 1000 10000 --output results.jsonl
+#                  python3 benchmark.py --maps sc oa-compact --keys random --sizes 10000000
+#
+#              Sequential and anagram keys under hash_function_1 collapse onto a few hundred
+#              distinct hashes, so those combinations grow quadratically; keep their sizes small.
+
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from a6_include import (DynamicArray, HASH_FUNCTIONS, SEEDED_HASH_FUNCTIONS,
+                        resolve_hash_function)
+import hash_map_oa
+import hash_map_sc
+
+
+MAPS = {
+    'sc': lambda function: hash_map_sc.HashMap(11, function),
+    'sc-incremental': lambda function: hash_map_sc.HashMap(11, function, incremental=True),
+    'sc-adaptive': lambda function: hash_map_sc.HashMap(11, function, adaptive_buckets=True),
+    'oa': lambda function: hash_map_oa.HashMap(11, function),
+    'oa-robinhood': lambda function: hash_map_oa.RobinHoodHashMap(11, function),
+    'oa-compact': lambda function: hash_map_oa.CompactHashMap(11, function),
+    'oa-pow2': lambda function: hash_map_oa.PowerOfTwoHashMap(11, function),
+}
+
+OPERATIONS = ('put', 'put_many', 'get_hit', 'get_miss', 'remove', 'resize', 'iterate', 'save',
+              'load', 'find_mode', 'find_mode_parallel')
+
+
+def sequential_keys(count: int, rnd: random.Random) -> tuple[list, list]:
+    """
+    Return count stored keys 'key0'..'key<count-1>' and count absent keys of the same shape.
+    """
+    return (['key' + str(i) for i in range(count)],
+            ['key' + str(i) for i in range(count, 2 * count)])
+
+
+def random_keys(count: int, rnd: random.Random) -> tuple[list, list]:
+    """
+    Return count stored and count absent distinct random keys of 8 to 16 ASCII letters and digits.
+    """
+    alphabet = string.ascii_letters + string.digits
+    seen = set()
+    while len(seen) < 2 * count:
+        seen.add(''.join(rnd.choices(alphabet, k=rnd.randint(8, 16))))
+    keys = list(seen)
+    rnd.shuffle(keys)
+    return keys[:count], keys[count:]
+
+
+def anagram_keys(count: int, rnd: random.Random) -> tuple[list, list]:
+    """
+    Return count stored and count absent distinct permutations of one 12-letter word.
+    Every key has the same character sum, so all of them collide under hash_function_1.
+    """
+    letters = list('abcdefghijkl')
+    seen = set()
+    while len(seen) < 2 * count:
+        rnd.shuffle(letters)
+        seen.add(''.join(letters))
+    keys = list(seen)
+    rnd.shuffle(keys)
+    return keys[:count], keys[count:]
+
+
+KEY_SETS = {
+    'sequential': sequential_keys,
+    'random': random_keys,
+    'anagram': anagram_keys,
+}
+
+
+def timed(action) -> float:
+    """
+    Run action once with the garbage collector paused, as timeit does, and return the elapsed seconds.
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        action()
+        return time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def build(factory, function, keys: list):
+    """
+    Build a map holding every key, mapped to its position in keys.
+    """
+    m = factory(function)
+    for i in range(len(keys)):
+        m.put(keys[i], i)
+    return m
+
+
+def peak_memory(factory, function, keys: list) -> int:
+    """
+    Return the peak traced memory, in bytes, of building a map of keys from empty.
+    """
+    gc.collect()
+    tracemalloc.start()
+    m = build(factory, function, keys)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del m
+    return peak
+
+
+def run_map_operation(operation: str, factory, function, keys: list, misses: list):
+    """
+    Time one map operation over every key and return (seconds, map after the operation).
+    """
+    if operation == 'put':
+        holder = []
+        seconds = timed(lambda: holder.append(build(factory, function, keys)))
+        return seconds, holder[0]
+
+    if operation == 'put_many':
+        m = factory(function)
+        return timed(lambda: m.put_many(zip(keys, range(len(keys))))), m
+
+    m = build(factory, function, keys)
+    if operation in ('save', 'load'):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'map.snapshot')
+            m.save(path)
+            if operation == 'save':
+                return timed(lambda: m.save(path)), m
+            holder = []
+            seconds = timed(lambda: holder.append(type(m).load(path)))
+        return seconds, holder[0]
+
+    if operation == 'get_hit':
+        seconds = timed(lambda: [m.get(key) for key in keys])
+    elif operation == 'get_miss':
+        seconds = timed(lambda: [m.get(key) for key in misses])
+    elif operation == 'remove':
+        seconds = timed(lambda: [m.remove(key) for key in keys])
+    elif operation == 'iterate':
+        seconds = timed(lambda: sum(1 for _ in m.items()))
+    else:
+        seconds = timed(lambda: m.resize_table(m.get_capacity() * 2))
+    return seconds, m
+
+
+def table_quality(m) -> dict:
+    """
+    Return how long lookups of the stored keys are in map m: the average and
+    longest number of nodes (SC) or buckets (OA) examined by a successful get().
+    """
+    if hasattr(m, 'average_probe_length'):
+        return {'avg_probe': round(m.average_probe_length(), 3),
+                'max_probe': m.max_probe_length()}
+
+    chains = m.stats()['chain_lengths']
+    visited = sum(length * (length + 1) // 2 * count for length, count in enumerate(chains))
+    return {'avg_chain': round(visited / m.get_size(), 3) if m.get_size() else 0.0,
+            'max_chain': len(chains) - 1}
+
+
+def run_find_mode(operation: str, keys: list, rnd: random.Random) -> float:
+    """
+    Time find_mode or find_mode_parallel over an array of len(keys) values drawn with
+    repetition from keys.
+    """
+    da = DynamicArray(rnd.choices(keys, k=len(keys)))
+    return timed(lambda: getattr(hash_map_sc, operation)(da))
+
+
+def benchmark(args) -> None:
+    """
+    Run every requested combination and write one JSON record per measurement.
+    """
+    out = open(args.output, 'w') if args.output else sys.stdout
+    python = platform.python_implementation() + ' ' + platform.python_version()
+
+    for size, key_set in itertools.product(args.sizes, args.keys):
+        rnd = random.Random(args.seed)
+        keys, misses = KEY_SETS[key_set](size, rnd)
+
+        for map_name, function_name, operation in itertools.product(args.maps, args.functions,
+                                                                      args.operations):
+            if operation.startswith('find_mode'):
+                # find_mode always counts with the default separate chaining HashMap.
+                if map_name != 'sc' or function_name != 'hash_function_1':
+                    continue
+                seconds = min(run_find_mode(operation, keys, random.Random(args.seed))
+                              for _ in range(args.repeat))
+                record = {'map': 'sc', 'function': 'hash_function_1'}
+            else:
+                seeded = HASH_FUNCTIONS[function_name] in SEEDED_HASH_FUNCTIONS
+                factory = MAPS[map_name]
+                function, _, _ = resolve_hash_function(function_name,
+                                                       args.seed if seeded else None)
+                runs = [run_map_operation(operation, factory, function, keys, misses)
+                        for _ in range(args.repeat)]
+                seconds = min(run[0] for run in runs)
+                m = runs[-1][1]
+                record = {'map': map_name, 'function': function_name,
+                          'capacity': m.get_capacity(), 'load': round(m.table_load(), 4)}
+                if operation == 'put':
+                    record.update(table_quality(m))
+                if operation == 'put' and args.memory:
+                    record['peak_bytes'] = peak_memory(factory, function, keys)
+
+            record.update({'keys': key_set, 'size': size, 'op': operation,
+                           'seconds': round(seconds, 6),
+                           'ops_per_sec': round(size / seconds) if seconds else None,
+                           'python': python, 'seed': args.seed})
+            out.write(json.dumps(record) + '\n')
+            out.flush()
+
+    if out is not sys.stdout:
+        out.close()
+
+
+def parse_args(argv=None):
+    """
+    Parse the command line options of the benchmark suite.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the SC and OA hash maps.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000],
+                        help='map sizes to measure, e.g. 1000 10000 100000 1000000 10000000')
+    parser.add_argument('--maps', nargs='+', choices=sorted(MAPS), default=sorted(MAPS))
+    parser.add_argument('--functions', nargs='+', choices=sorted(HASH_FUNCTIONS),
+                        default=sorted(HASH_FUNCTIONS),
+                        help='hash functions by name; siphash is seeded with --seed')
+    parser.add_argument('--keys', nargs='+', choices=sorted(KEY_SETS), default=sorted(KEY_SETS))
+    parser.add_argument('--operations', nargs='+', choices=OPERATIONS, default=list(OPERATIONS))
+    parser.add_argument('--repeat', type=int, default=1,
+                        help='runs per measurement; the fastest is reported')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed for key generation and for seeded hash functions')
+    parser.add_argument('--no-memory', dest='memory', action='store_false',
+                        help='skip the traced peak memory measurement')
+    parser.add_argument('--output', help='write JSON Lines here instead of stdout')
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    benchmark(parse_args())
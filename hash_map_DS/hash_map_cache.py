@@ -0,0 +1,344 @@
+# Description: A bounded LRU cache with optional time-to-live, built on the separate
+#              chaining HashMap. LRUCache stores every entry in a CacheNode, an SLNode
+#              that is also linked into a doubly linked recency list, so a hit moves its
+#              node to the front and an eviction removes the node at the back, both in
+#              O(1). The cache is bounded by a number of entries, a number of bytes, or
+#              both, and counts its hits, misses, evictions and expirations.
+#
+#              Example:
+#                  cache = LRUCache(max_entries=10000, ttl=60.0)
+#                  value = cache.get(key)
+#                  if value is None:
+#                      value = slow_lookup(key)
+#                      cache.put(key, value)
+
+import sys
+import time
+
+from a6_include import DynamicArray, SLNode, hash_function_1
+from hash_map_sc import HashMap
+
+
+class CacheNode(SLNode):
+    """
+    SLNode that is also an entry of the cache's recency list. newer and older
+    link it to its neighbours in that list; expires is the clock reading at
+    which the entry expires, or None; size is its estimated size in bytes.
+    """
+
+    __slots__ = ('newer', 'older', 'expires', 'size')
+
+    def __init__(self, key: str, value: object, hash: int = None) -> None:
+        """Initialize an unlinked node that never expires."""
+        super().__init__(key, value, None, hash)
+        self.newer = None
+        self.older = None
+        self.expires = None
+        self.size = 0
+
+
+def entry_size(key: str, value: object) -> int:
+    """
+    Estimate the bytes held by a cache entry: the shallow sizes of its key,
+    its value and its CacheNode. Objects the value refers to are not counted.
+    """
+    return sys.getsizeof(key) + sys.getsizeof(value) + CacheNode.__basicsize__
+
+
+class LRUCache(HashMap):
+    """
+    Separate chaining HashMap that evicts its least recently used entries to
+    stay within max_entries entries and max_bytes bytes (either limit may be
+    None). put() and a successful get() make an entry the most recently used.
+
+    An entry put with a ttl, or with the cache's default ttl, expires ttl
+    seconds later. Expiry is lazy: an expired entry is dropped when it is
+    looked up, or when it reaches the back of the recency list while a put()
+    makes room. Until then it still counts towards the limits.
+
+    A resize relinks the existing nodes into the new table, so the recency
+    list survives it unchanged. All other HashMap methods are available.
+    get_keys_and_values() and the views keys(), values() and items() may
+    include expired entries that have not been dropped yet, and do not change
+    the recency of the entries they visit.
+    """
+
+    def __init__(self, max_entries: int = None, max_bytes: int = None, ttl: float = None,
+                 capacity: int = 11, function: callable = hash_function_1,
+                 seed: int = None, sizeof: callable = entry_size,
+                 clock: callable = time.monotonic) -> None:
+        """
+        Initialize an empty cache. sizeof(key, value) estimates an entry's size
+        in bytes for max_bytes; clock() returns the current time in seconds for
+        ttl. capacity, function and seed are as for HashMap.
+        """
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        super().__init__(capacity, function, seed=seed)
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._sizeof = sizeof
+        self._clock = clock
+        self._bytes = 0
+
+        # Sentinel of the circular recency list: its older link is the most
+        # recently used node and its newer link the least recently used one.
+        self._recent = CacheNode(None, None)
+        self._recent.newer = self._recent.older = self._recent
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object, ttl: float = None) -> None:
+        """
+        This method stores a key/value pair as the most recently used entry and
+        then evicts least recently used entries until the cache is within its
+        limits.
+        :param key: The key of the entry.
+        :param value: The value of the entry.
+        :param ttl: Seconds until the entry expires; the cache's default if None.
+        """
+
+        self._make_room()
+        hash = self._hash_function(key)
+        node = self._find_node(key, hash)
+        if node is None:
+            node = self._insert_node(key, value, hash)
+        else:
+            self._bytes = self._bytes - node.size
+            node.value = value
+            node.size = self._sizeof(key, value)
+            self._bytes = self._bytes + node.size
+            self._touch(node)
+
+        ttl = self._ttl if ttl is None else ttl
+        node.expires = None if ttl is None else self._clock() + ttl
+        self._evict()
+
+    def put_many(self, pairs) -> None:
+        """
+        This method puts every key/value pair of an iterable, in order.
+        :param pairs: An iterable of (key, value) tuples.
+        """
+
+        for key, value in pairs:
+            self.put(key, value)
+
+    def get(self, key: str) -> object:
+        """
+        This method returns the value cached for key and makes it the most
+        recently used entry. A missing or expired key returns None and counts
+        as a miss; an expired entry is dropped.
+        :param key: The key of the entry.
+        :return: The cached value, or None.
+        """
+
+        node = self._live_node(key, self._hash_function(key))
+        if node is None:
+            self._misses = self._misses + 1
+            return None
+
+        self._hits = self._hits + 1
+        self._touch(node)
+        return node.value
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        This method gets every key of an iterable, in order.
+        :param keys: An iterable of keys.
+        :return: A DynamicArray with one value (or None) per key.
+        """
+
+        values = DynamicArray()
+        for key in keys:
+            values.append(self.get(key))
+        return values
+
+    def contains_key(self, key: str) -> bool:
+        """
+        This method checks whether key is cached and has not expired, without
+        changing its recency or the hit and miss counters.
+        :param key: The key being checked.
+        :return: True if the key is cached, otherwise False.
+        """
+
+        return self._live_node(key, self._hash_function(key)) is not None
+
+    def clear(self) -> None:
+        """
+        This method empties the cache, leaving its capacity unchanged.
+        """
+
+        super().clear()
+        self._recent.newer = self._recent.older = self._recent
+        self._bytes = 0
+
+    def get_bytes(self) -> int:
+        """
+        Return the estimated size of the cached entries in bytes.
+        """
+        return self._bytes
+
+    def stats(self) -> dict:
+        """
+        This method reports the statistics of HashMap.stats() together with the
+        cache's own counters.
+        :return: A dict as described in HashMap.stats(), plus bytes, hits, misses,
+        hit_rate, evictions (entries dropped to respect the limits) and
+        expirations (expired entries dropped).
+        """
+
+        stats = super().stats()
+        lookups = self._hits + self._misses
+        stats.update({
+            'bytes': self._bytes,
+            'hits': self._hits,
+            'misses': self._misses,
+            'hit_rate': self._hits / lookups if lookups else 0.0,
+            'evictions': self._evictions,
+            'expirations': self._expirations,
+        })
+        return stats
+
+    def _new_node(self, key: str, value: object, hash: int) -> CacheNode:
+        """
+        This method creates the CacheNode for a new key and links it in as the
+        most recently used entry.
+        :return: The new CacheNode.
+        """
+
+        node = CacheNode(key, value, hash)
+        node.size = self._sizeof(key, value)
+        self._bytes = self._bytes + node.size
+
+        recent = self._recent
+        node.newer, node.older = recent, recent.older
+        recent.older.newer = node
+        recent.older = node
+        return node
+
+    def _remove_hashed(self, key: str, hash: int) -> None:
+        """
+        This method removes key from the table and from the recency list.
+        :param key: Key to be removed from the cache.
+        :param hash: The hash of key under the map's hash function.
+        """
+
+        node = self._find_node(key, hash)
+        if node is None:
+            return
+
+        node.newer.older = node.older
+        node.older.newer = node.newer
+        self._bytes = self._bytes - node.size
+        super()._remove_hashed(key, hash)
+
+    def _touch(self, node: CacheNode) -> None:
+        """
+        This method moves a node to the front of the recency list.
+        :param node: A CacheNode in the cache.
+        """
+
+        node.newer.older = node.older
+        node.older.newer = node.newer
+
+        recent = self._recent
+        node.newer, node.older = recent, recent.older
+        recent.older.newer = node
+        recent.older = node
+
+    def _live_node(self, key: str, hash: int):
+        """
+        This method finds the node of key, dropping it instead if it has expired.
+        :param key: The key being searched for.
+        :param hash: The hash of key under the map's hash function.
+        :return: The CacheNode, or None if the key is missing or expired.
+        """
+
+        if self._next_buckets is not None or self._old_buckets is not None:
+            self._migrate(self._migrate_step)
+
+        node = self._lookup_node(key, hash)
+        if node is not None and node.expires is not None and node.expires <= self._clock():
+            self._remove_hashed(key, hash)
+            self._expirations = self._expirations + 1
+            return None
+        return node
+
+    def _evict(self) -> None:
+        """
+        This method drops entries from the back of the recency list while the
+        cache exceeds a limit or the least recently used entry has expired.
+        """
+
+        recent = self._recent
+        now = None
+        while self._size > 0:
+            oldest = recent.newer
+            if ((self._max_entries is not None and self._size > self._max_entries)
+                    or (self._max_bytes is not None and self._bytes > self._max_bytes)):
+                self._evictions = self._evictions + 1
+            elif oldest.expires is not None:
+                now = self._clock() if now is None else now
+                if oldest.expires > now:
+                    return
+                self._expirations = self._expirations + 1
+            else:
+                return
+            self._remove_hashed(oldest.key, oldest.hash)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+
+if __name__ == "__main__":
+
+    print("\nLRUCache example")
+    print("----------------")
+    cache = LRUCache(max_entries=3)
+    for key in ('a', 'b', 'c'):
+        cache.put(key, key.upper())
+    cache.get('a')
+    cache.put('d', 'D')
+    print(cache.get('b'), cache.get('a'), cache.get('c'), cache.get('d'), cache.get_size())
+    stats = cache.stats()
+    print(stats['hits'], stats['misses'], stats['evictions'], round(stats['hit_rate'], 2))
+
+    print("\nLRUCache max_bytes example")
+    print("--------------------------")
+    cache = LRUCache(max_bytes=10000, sizeof=lambda key, value: len(value))
+    for i in range(100):
+        cache.put('key' + str(i), 'x' * 1000)
+    print(cache.get_size(), cache.get_bytes(), cache.get('key89'), cache.get('key90') is not None,
+          cache.stats()['evictions'])
+
+    print("\nLRUCache ttl example")
+    print("--------------------")
+    now = [0.0]
+    cache = LRUCache(max_entries=100, ttl=10.0, clock=lambda: now[0])
+    cache.put('short', 1, ttl=1.0)
+    cache.put('default', 2)
+    cache.put('forever', 3, ttl=float('inf'))
+    now[0] = 5.0
+    print(cache.get('short'), cache.get('default'), cache.contains_key('forever'))
+    now[0] = 20.0
+    print(cache.get('default'), cache.get('forever'), cache.get_size(),
+          cache.stats()['expirations'])
+
+    print("\nLRUCache resize example")
+    print("-----------------------")
+    cache = LRUCache(max_entries=500, capacity=11, function='fnv1a')
+    for i in range(2000):
+        cache.put('key' + str(i), i)
+        if i % 3 == 0:
+            cache.get('key' + str(i // 2))
+    node, order = cache._recent.older, 0
+    while node is not cache._recent:
+        node, order = node.older, order + 1
+    print(cache.get_size(), cache.get_capacity(), order, cache.get('key1999'), cache.get('key0'))
@@ -0,0 +1,500 @@
+# Description: A thread-safe separate chaining hash map using lock striping.
+#              ConcurrentHashMap divides its buckets into a fixed number of stripes,
+#              bucket i belonging to stripe i % stripes, and guards each stripe with its
+#              own lock. An operation on one key only locks the stripe of that key's
+#              bucket, so threads working on different stripes never wait for each other.
+#              Resizing, clearing and whole-table reads take every stripe lock, always
+#              in stripe order, so they cannot deadlock with each other.
+#
+#              Example:
+#                  m = ConcurrentHashMap(11, 'fnv1a', stripes=16)
+#                  threads share m and call m.put(), m.get(), m.remove() freely
+
+import threading
+import time
+
+from a6_include import DynamicArray, hash_function_1, hash_keys
+from hash_map_sc import HashMap
+
+
+class _Stripe:
+    """
+    The lock of one stripe of buckets, and the statistics of those buckets,
+    which are only updated while the lock is held.
+    """
+
+    __slots__ = ('lock', 'size', 'chains', 'inserts', 'collisions', 'lookups', 'visits')
+
+    def __init__(self) -> None:
+        """Initialize an unlocked stripe with no buckets counted."""
+        self.lock = threading.RLock()
+        self.size = 0
+        self.chains = [0]
+        self.inserts = 0
+        self.collisions = 0
+        self.lookups = 0
+        self.visits = 0
+
+    def find(self, bucket, key: str, hash: int):
+        """Find key in one of the stripe's buckets, counting the nodes visited."""
+        node, visited = bucket.locate(key, hash)
+        self.lookups = self.lookups + 1
+        self.visits = self.visits + visited
+        return node
+
+    def count_chain(self, before: int, after: int) -> None:
+        """Record that a bucket went from holding before to holding after nodes."""
+        chains = self.chains
+        chains[before] = chains[before] - 1
+        if after == len(chains):
+            chains.append(0)
+        chains[after] = chains[after] + 1
+
+
+class ConcurrentHashMap(HashMap):
+    """
+    Separate chaining HashMap that may be shared between threads.
+
+    Every operation on a key locks only the stripe of the key's bucket. The
+    table it looked in is checked again once the lock is held: if a resize
+    replaced the table in the meantime, the stripe is released and the lookup
+    retried against the new table. Each stripe keeps its own size and
+    chain-length counters, so no lock or counter is shared by all writers.
+
+    Growth takes every stripe lock in stripe order and then rebuilds the table
+    as HashMap.resize_table() does. Operations that walk the whole table
+    (clear(), save() and str()) also take every lock, so they see a consistent
+    table. The iteration views keys(), values() and items(), and with them
+    get_keys_and_values(), take every lock only long enough to collect the
+    nodes of the table; other threads may write while a view is consumed,
+    which never makes it raise. A view sees the keys present when it started
+    and, for those keys, the values present when it reaches them. Incremental resizing, shrink_load and
+    chain_policy are not supported. Stripe locks are reentrant, so a thread
+    that holds every lock may call any method.
+    """
+
+    def __init__(self, capacity: int = 11, function: callable = hash_function_1,
+                 stripes: int = 16, seed: int = None) -> None:
+        """
+        Initialize a new, empty ConcurrentHashMap whose buckets are guarded by
+        the given number of stripe locks. capacity, function and seed are as for
+        HashMap.
+        """
+        if stripes < 1:
+            raise ValueError("a ConcurrentHashMap needs at least one stripe")
+
+        self._stripes = [_Stripe() for _ in range(stripes)]
+        super().__init__(capacity, function, seed=seed)
+        self._recount()
+
+    def __str__(self) -> str:
+        """Return the buckets, one per line, as HashMap does."""
+        self._lock_all()
+        try:
+            return super().__str__()
+        finally:
+            self._unlock_all()
+
+    def get_size(self) -> int:
+        """
+        Return size of map, summed over the stripes. While other threads are
+        writing, the result may be slightly out of date.
+        """
+        return sum(stripe.size for stripe in self._stripes)
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        This method adds or updates a key/value pair, locking only the stripe of
+        the key's bucket. The table is grown first once its load factor reaches 1.0.
+        :param key: A key assigned to a value for purposes of efficient lookup.
+        :param value: A value of an object in the hash_map.
+        """
+
+        self._grow_if_full(1)
+        self._put_locked(key, value, self._hash_function(key))
+
+    def put_many(self, pairs) -> None:
+        """
+        This method adds every key/value pair of an iterable, hashing every key in
+        a single pass and sizing the table once for the whole batch. Each pair is
+        then stored under its own stripe lock, so the batch is not atomic.
+        :param pairs: An iterable of (key, value) tuples.
+        """
+
+        pairs = list(pairs)
+        self._grow_if_full(len(pairs))
+
+        hashes = hash_keys(self._hash_function, [key for key, _ in pairs])
+        for i in range(len(pairs)):
+            key, value = pairs[i]
+            self._put_locked(key, value, hashes[i])
+
+    def get(self, key: str) -> object:
+        """
+        This method returns the value associated with key, or None if the key is
+        not present, locking only the stripe of the key's bucket.
+        :param key: The key of the value being retrieved.
+        :return: The value if it exists, otherwise None.
+        """
+
+        hash = self._hash_function(key)
+        stripe, bucket = self._lock_bucket(hash)
+        try:
+            node = stripe.find(bucket, key, hash)
+            return node.value if node else None
+        finally:
+            stripe.lock.release()
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        This method looks up every key of an iterable and returns the associated
+        values in input order, with None for missing keys.
+        :param keys: An iterable of keys.
+        :return: A DynamicArray with one value (or None) per key.
+        """
+
+        keys = list(keys)
+        hashes = hash_keys(self._hash_function, keys)
+        values = DynamicArray()
+        for i in range(len(keys)):
+            stripe, bucket = self._lock_bucket(hashes[i])
+            try:
+                node = stripe.find(bucket, keys[i], hashes[i])
+                values.append(node.value if node else None)
+            finally:
+                stripe.lock.release()
+        return values
+
+    def contains_key(self, key: str) -> bool:
+        """
+        This checks whether a particular key exists within the hash_map.
+        :param key: A key being checked to determine if it is present.
+        :return: True if the key is present, otherwise False.
+        """
+
+        hash = self._hash_function(key)
+        stripe, bucket = self._lock_bucket(hash)
+        try:
+            return stripe.find(bucket, key, hash) is not None
+        finally:
+            stripe.lock.release()
+
+    def remove(self, key: str) -> None:
+        """
+        This method removes key from the hash_map, if present, locking only the
+        stripe of the key's bucket.
+        :param key: Key to be removed from the hashmap.
+        """
+
+        self._remove_locked(key, self._hash_function(key))
+
+    def remove_many(self, keys) -> None:
+        """
+        This method removes every key of an iterable from the hash_map. Keys that
+        are not present are ignored.
+        :param keys: An iterable of keys.
+        """
+
+        keys = list(keys)
+        hashes = hash_keys(self._hash_function, keys)
+        for i in range(len(keys)):
+            self._remove_locked(keys[i], hashes[i])
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        This method resizes the table as HashMap.resize_table() does, while
+        holding every stripe lock, and then recounts the stripes' statistics.
+        :param new_capacity: The capacity to which the table is being resized.
+        """
+
+        self._lock_all()
+        try:
+            super().resize_table(new_capacity)
+            self._recount()
+        finally:
+            self._unlock_all()
+
+    def table_load(self) -> float:
+        """
+        This method provides the current load factor of the hash_table.
+        """
+
+        return self.get_size() / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        This method returns the number of empty buckets, summed over the stripes.
+        :return: The number of empty buckets.
+        """
+
+        return sum(stripe.chains[0] for stripe in self._stripes)
+
+    def clear(self) -> None:
+        """
+        This method empties the hash_map, leaving its capacity unchanged.
+        """
+
+        self._lock_all()
+        try:
+            super().clear()
+            self._recount()
+        finally:
+            self._unlock_all()
+
+    def save(self, path: str) -> None:
+        """
+        This method writes a snapshot of the hash_map, as HashMap.save() does,
+        while holding every stripe lock.
+        :param path: The file to be written.
+        """
+
+        self._lock_all()
+        try:
+            self._size = self.get_size()
+            super().save(path)
+        finally:
+            self._unlock_all()
+
+    @classmethod
+    def load(cls, path: str, **options) -> "ConcurrentHashMap":
+        """
+        This method rebuilds a ConcurrentHashMap from a snapshot written by save().
+        :param path: The snapshot file to be read.
+        :param options: Further constructor arguments, e.g. stripes=64.
+        :return: The rebuilt map.
+        """
+
+        m = super().load(path, **options)
+        m._recount()
+        return m
+
+    def stats(self) -> dict:
+        """
+        This method reports the same statistics as HashMap.stats(), summed over
+        the stripes without taking their locks, so it never blocks a writer.
+        :return: A dict as described in HashMap.stats().
+        """
+
+        stripes = self._stripes
+        chains = [0] * max(len(stripe.chains) for stripe in stripes)
+        for stripe in stripes:
+            for length in range(len(stripe.chains)):
+                chains[length] = chains[length] + stripe.chains[length]
+        while len(chains) > 1 and chains[-1] == 0:
+            chains.pop()
+
+        size = sum(stripe.size for stripe in stripes)
+        inserts = sum(stripe.inserts for stripe in stripes)
+        collisions = sum(stripe.collisions for stripe in stripes)
+        lookups = sum(stripe.lookups for stripe in stripes)
+        visits = sum(stripe.visits for stripe in stripes)
+        return {
+            'size': size,
+            'capacity': self._capacity,
+            'load': size / self._capacity,
+            'chain_lengths': chains,
+            'empty_buckets': chains[0],
+            'inserts': inserts,
+            'collisions': collisions,
+            'collision_rate': collisions / inserts if inserts else 0.0,
+            'resizes': self._resizes,
+            'resize_seconds': self._resize_seconds,
+            'lookups': lookups,
+            'nodes_visited': visits,
+            'nodes_per_lookup': visits / lookups if lookups else 0.0,
+        }
+
+    def _lock_bucket(self, hash: int) -> tuple:
+        """
+        This method locks the stripe of the bucket that hash maps to. If the table
+        was replaced by a resize between choosing the stripe and acquiring its
+        lock, the lock is released and the bucket chosen again.
+        :param hash: The hash of a key under the map's hash function.
+        :return: The locked _Stripe and the bucket's LinkedList.
+        """
+
+        while True:
+            buckets, capacity = self._buckets, self._capacity
+            index = hash % capacity
+            stripe = self._stripes[index % len(self._stripes)]
+            stripe.lock.acquire()
+            if self._buckets is buckets and self._capacity == capacity:
+                return stripe, buckets.get_at_index(index)
+            stripe.lock.release()
+
+    def _put_locked(self, key: str, value: object, hash: int) -> None:
+        """
+        This method inserts or updates a key/value pair whose hash has already
+        been computed, under the lock of its stripe.
+        :param key: The key of the element.
+        :param value: The value of the element.
+        :param hash: The hash of key under the map's hash function.
+        """
+
+        stripe, bucket = self._lock_bucket(hash)
+        try:
+            node = bucket.contains(key, hash)
+            if node is not None:
+                node.value = value
+                return
+
+            length = bucket.length()
+            bucket.insert(key, value, hash)
+            stripe.size = stripe.size + 1
+            stripe.count_chain(length, length + 1)
+            stripe.inserts = stripe.inserts + 1
+            if length > 0:
+                stripe.collisions = stripe.collisions + 1
+        finally:
+            stripe.lock.release()
+
+    def _remove_locked(self, key: str, hash: int) -> None:
+        """
+        This method removes key, if present, under the lock of its stripe.
+        :param key: Key to be removed from the hashmap.
+        :param hash: The hash of key under the map's hash function.
+        """
+
+        stripe, bucket = self._lock_bucket(hash)
+        try:
+            if bucket.remove(key, hash):
+                stripe.size = stripe.size - 1
+                stripe.count_chain(bucket.length() + 1, bucket.length())
+        finally:
+            stripe.lock.release()
+
+    def _grow_if_full(self, count: int) -> None:
+        """
+        This method grows the table before count new keys are added, if they
+        could take the load factor past 1.0. The check is repeated once every
+        lock is held, so threads racing to grow the table only grow it once.
+        :param count: The number of keys about to be inserted.
+        """
+
+        if self.get_size() + count <= self._capacity:
+            return
+
+        self._lock_all()
+        try:
+            needed = self.get_size() + count
+            new_capacity = self._capacity
+            while needed > new_capacity:
+                new_capacity = self._next_prime(new_capacity * 2)
+            if new_capacity != self._capacity:
+                self.resize_table(new_capacity)
+        finally:
+            self._unlock_all()
+
+    def _iter_nodes(self):
+        """
+        This generator yields the nodes of the table as they were when it
+        started, collected while holding every stripe lock.
+        """
+
+        self._lock_all()
+        try:
+            nodes = [node for node in super()._iter_nodes()]
+        finally:
+            self._unlock_all()
+        yield from nodes
+
+    def _lock_all(self) -> None:
+        """
+        This method acquires every stripe lock, in stripe order.
+        """
+
+        for stripe in self._stripes:
+            stripe.lock.acquire()
+
+    def _unlock_all(self) -> None:
+        """
+        This method releases every stripe lock, in reverse stripe order.
+        """
+
+        for stripe in reversed(self._stripes):
+            stripe.lock.release()
+
+    def _recount(self) -> None:
+        """
+        This method rebuilds every stripe's size and chain-length counters from
+        the buckets. It is called with every lock held, after the table is
+        rebuilt.
+        """
+
+        count = len(self._stripes)
+        for stripe in self._stripes:
+            stripe.size = 0
+            stripe.chains = [0]
+
+        for i in range(self._buckets.length()):
+            stripe = self._stripes[i % count]
+            length = self._buckets.get_at_index(i).length()
+            while length >= len(stripe.chains):
+                stripe.chains.append(0)
+            stripe.chains[length] = stripe.chains[length] + 1
+            stripe.size = stripe.size + length
+        self._size = sum(stripe.size for stripe in self._stripes)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+
+if __name__ == "__main__":
+
+    import random
+    import sys
+
+    print("\nConcurrentHashMap example")
+    print("-------------------------")
+    m = ConcurrentHashMap(11, 'fnv1a', stripes=8)
+    for i in range(100):
+        m.put('key' + str(i), i)
+    m.remove('key7')
+    print(m.get_size(), m.get_capacity(), m.get('key8'), m.get('key7'), m.contains_key('key99'))
+
+    print("\nConcurrentHashMap stress test")
+    print("-----------------------------")
+    # Switch threads as often as possible to provoke interleavings.
+    sys.setswitchinterval(1e-6)
+    m = ConcurrentHashMap(11, 'fnv1a', stripes=8)
+    threadCount, perThread = 8, 2000
+    errors = []
+
+    def worker(number: int) -> None:
+        """
+        Each thread writes its own keys, checks them, removes every third one and
+        meanwhile reads and overwrites a set of keys shared by all threads.
+        """
+        rnd = random.Random(number)
+        try:
+            for i in range(perThread):
+                m.put(f't{number}-{i}', i)
+                m.put('shared' + str(rnd.randrange(50)), number)
+                if m.get(f't{number}-{rnd.randrange(i + 1)}') is None:
+                    errors.append(('lost key', number, i))
+            for i in range(0, perThread, 3):
+                m.remove(f't{number}-{i}')
+            m.put_many((f'b{number}-{i}', i) for i in range(200))
+        except Exception as exception:
+            errors.append(exception)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(threadCount)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    sys.setswitchinterval(0.005)
+
+    expected = threadCount * (perThread - len(range(0, perThread, 3)) + 200) + 50
+    pairs = m.get_keys_and_values()
+    stats = m.stats()
+    emptyBuckets = sum(1 for i in range(m.get_capacity()) if m._buckets[i].length() == 0)
+    print(errors, m.get_size() == expected == pairs.length(),
+          stats['empty_buckets'] == emptyBuckets, stats['resizes'] > 0)
+    print(all(m.get(f't{n}-{i}') == (None if i % 3 == 0 else i)
+              for n in range(threadCount) for i in range(perThread)),
+          all(m.get('shared' + str(i)) in range(threadCount) for i in range(50)))
+    print(f"{threadCount} threads, {round(time.perf_counter() - start, 2)} seconds")
@@ -0,0 +1,522 @@
+# Description: A file-backed open addressing hash map for tables larger than memory.
+#              MmapHashMap keeps its slots in a memory-mapped file and its keys and values
+#              in an append-only heap file next to it, so opening an existing table only
+#              reads its header and a lookup only touches the pages it probes.
+#
+#              Slot file (path):         a header, then four fixed-width columns of
+#                                        capacity entries each: the cached 64-bit hashes,
+#                                        the heap offsets of the keys, the heap offsets of
+#                                        the values, and a one-byte state per slot.
+#              Heap file (path + .heap): length-prefixed key and value records, appended
+#                                        and never rewritten.
+#
+#              A resize or compaction fills a new slot file next to path while reading
+#              the old one, then moves it over path, so a crash midway leaves the old
+#              table intact (and an unfinished *.resize file beside it).
+#
+#              Example:
+#                  with MmapHashMap('table.map') as m:
+#                      m.put('key', 'value')
+
+import os
+import shutil
+import struct
+import tempfile
+from mmap import mmap
+
+from a6_include import (DynamicArray, HASH_FUNCTIONS, SEEDED_HASH_FUNCTIONS, check_storable,
+                        decode_value, encode_value, read_snapshot_header)
+from hash_map_oa import CompactHashMap, EMPTY, FULL
+
+
+# magic, version, capacity, size, tombstones, seed (low and high 64 bits), hash function name
+HEADER = struct.Struct('<8sIQQQQQ16s')
+HEADER_SIZE = 128
+MAGIC = b'HMAPMMAP'
+VERSION = 1
+
+# A heap record is a type tag and the payload length, followed by the payload.
+RECORD = struct.Struct('<cI')
+HEAP_MAGIC = b'HEAP'
+
+
+class _Heap:
+    """
+    Append-only file of key and value records, addressed by byte offset.
+    Offset 0 holds a magic number, so no record ever starts there and a
+    stored offset of 0 can stand for "no record".
+    """
+
+    __slots__ = ('_file', '_end')
+
+    def __init__(self, path: str) -> None:
+        """Open the heap file at path, creating it if needed."""
+        self._file = open(path, 'r+b' if os.path.exists(path) else 'w+b')
+        self._end = self._file.seek(0, os.SEEK_END)
+        if self._end == 0:
+            self._file.write(HEAP_MAGIC)
+            self._end = len(HEAP_MAGIC)
+
+    def append(self, value) -> int:
+        """Append a record for value and return its offset."""
+        tag, payload = encode_value(value)
+        offset = self._end
+        self._file.seek(offset)
+        self._file.write(RECORD.pack(tag, len(payload)) + payload)
+        self._end = offset + RECORD.size + len(payload)
+        return offset
+
+    def read(self, offset: int):
+        """Return the value of the record at offset."""
+        self._file.seek(offset)
+        tag, length = RECORD.unpack(self._file.read(RECORD.size))
+        return decode_value(tag, self._file.read(length))
+
+    def truncate(self) -> None:
+        """Drop every record."""
+        self._file.truncate(len(HEAP_MAGIC))
+        self._end = len(HEAP_MAGIC)
+
+    def flush(self) -> None:
+        """Write buffered records to the file."""
+        self._file.flush()
+
+    def close(self) -> None:
+        """Close the heap file."""
+        self._file.close()
+
+
+class _HeapColumn:
+    """
+    A column of heap offsets that reads like a list of the values they point to.
+    Assigning a value appends it to the heap and stores the new offset;
+    assigning None stores offset 0.
+    """
+
+    __slots__ = ('_heap', '_offsets')
+
+    def __init__(self, heap: _Heap, offsets: memoryview) -> None:
+        """Wrap a column of offsets into heap."""
+        self._heap = heap
+        self._offsets = offsets
+
+    def __getitem__(self, index: int):
+        """Return the value stored for slot index, or None."""
+        offset = self._offsets[index]
+        return None if offset == 0 else self._heap.read(offset)
+
+    def __setitem__(self, index: int, value) -> None:
+        """Store value for slot index."""
+        self._offsets[index] = 0 if value is None else self._heap.append(value)
+
+
+class MmapHashMap(CompactHashMap):
+    """
+    CompactHashMap whose parallel slot arrays live in a memory-mapped file.
+    The hashes and states are memoryviews of the mapping, so CompactHashMap's
+    quadratic probing runs directly over the file. Keys and values are stored
+    in the heap file and are only read when a probe finds a matching hash.
+    Keys are strings; values may be str, bytes, or Python literals (numbers,
+    booleans, None and tuples, lists and dicts of literals).
+
+    Opening an existing file restores its capacity, size, hash function and seed
+    from the header, ignoring the corresponding arguments. Only hash functions
+    registered in a6_include.HASH_FUNCTIONS can be used, since the file must
+    hash the same way in every process. Overwritten and removed values stay in
+    the heap until clear(). Every change updates the header in the mapping, and
+    flush() and close(), which the with statement calls, write the slots and the
+    heap to disk. Resizing and compaction build a new slot file and replace the
+    old one with it, streaming the old slots rather than copying them to memory.
+    """
+
+    def __init__(self, path: str, capacity: int = 11, function='fnv1a',
+                 tombstone_limit: float = 0.25, shrink_load: float = None,
+                 seed: int = None) -> None:
+        """
+        Open the table stored at path, or create it with the given capacity,
+        hash function (a registered name) and seed.
+        """
+        header = None
+        if os.path.exists(path) and os.path.getsize(path) >= HEADER_SIZE:
+            with open(path, 'rb') as file:
+                header = HEADER.unpack(file.read(HEADER.size))
+            if header[0] != MAGIC or header[1] != VERSION:
+                raise ValueError(f"{path} is not an MmapHashMap file")
+            capacity = header[2]
+            function = header[7].rstrip(b'\0').decode('ascii')
+            seeded = HASH_FUNCTIONS.get(function) in SEEDED_HASH_FUNCTIONS
+            seed = header[5] | header[6] << 64 if seeded else None
+
+        self._path = path
+        self._file = open(path, 'r+b' if header else 'w+b')
+        self._filePath = path
+        self._heap = _Heap(path + '.heap')
+        self._mapping = None
+        # Slot files replaced during a resize, kept mapped until _commit().
+        self._retired = []
+        self._resizing = 0
+        # The capacity of the table being reopened, which _allocate() maps as is.
+        self._reopening = capacity if header else None
+        super().__init__(capacity, function, tombstone_limit, shrink_load, seed)
+        self._reopening = None
+
+        if self._hash_name is None:
+            self.close()
+            raise ValueError("MmapHashMap needs a hash function registered in HASH_FUNCTIONS")
+        if header:
+            self._capacity, self._size, self._tombstones = header[2], header[3], header[4]
+        self.flush()
+
+    @classmethod
+    def load(cls, path: str, map_path: str, **options) -> "MmapHashMap":
+        """
+        Rebuild a snapshot written by save() as a new MmapHashMap stored at
+        map_path, which must not exist yet.
+        """
+        if os.path.exists(map_path):
+            raise FileExistsError(map_path)
+        with open(path, 'rb') as file:
+            capacity, size, name, seed = read_snapshot_header(file)
+            m = cls(map_path, capacity, name, seed=seed, **options)
+            m._restore(file, capacity, size)
+        return m
+
+    def __enter__(self) -> "MmapHashMap":
+        """Use the map as a context manager that closes it on exit."""
+        return self
+
+    def __exit__(self, *exc) -> None:
+        """Close the map."""
+        self.close()
+
+    def put(self, key: str, value: object) -> None:
+        """
+        This method adds or updates a key/value pair as in CompactHashMap.
+        :raises TypeError: If key is not a str or value cannot be stored.
+        """
+
+        self._check_key(key)
+        super().put(key, value)
+
+    def put_many(self, pairs) -> None:
+        """
+        This method puts every key/value pair of an iterable as in CompactHashMap.
+        :raises TypeError: If a key is not a str or a value cannot be stored.
+        """
+
+        pairs = list(pairs)
+        for key, _ in pairs:
+            self._check_key(key)
+        super().put_many(pairs)
+
+    def get(self, key: str) -> object:
+        """
+        This method returns the value stored for key, or None.
+        :raises TypeError: If key is not a str.
+        """
+
+        self._check_key(key)
+        return super().get(key)
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        This method looks up every key of an iterable as in CompactHashMap.
+        :raises TypeError: If a key is not a str.
+        """
+
+        keys = list(keys)
+        for key in keys:
+            self._check_key(key)
+        return super().get_many(keys)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        This method checks whether key is stored in the map.
+        :raises TypeError: If key is not a str.
+        """
+
+        self._check_key(key)
+        return super().contains_key(key)
+
+    def remove(self, key: str) -> None:
+        """
+        This method removes key from the map, if present.
+        :raises TypeError: If key is not a str.
+        """
+
+        self._check_key(key)
+        super().remove(key)
+
+    def remove_many(self, keys) -> None:
+        """
+        This method removes every key of an iterable as in CompactHashMap.
+        :raises TypeError: If a key is not a str.
+        """
+
+        keys = list(keys)
+        for key in keys:
+            self._check_key(key)
+        super().remove_many(keys)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        This method resizes the table as in CompactHashMap, into a new slot file
+        that replaces the current one once every entry has been moved.
+        :param new_capacity: The requested capacity.
+        """
+
+        self._resizing = self._resizing + 1
+        try:
+            super().resize_table(new_capacity)
+        finally:
+            self._resizing = self._resizing - 1
+        # A resize nested in another one leaves the replacement to the outer one.
+        if self._resizing == 0:
+            self._commit()
+
+    def clear(self) -> None:
+        """
+        This method clears the contents of the hash map, without changing the
+        capacity of the table, and empties the heap file.
+        """
+
+        super().clear()
+        self._commit()
+        self._heap.truncate()
+
+    def flush(self) -> None:
+        """
+        This method writes the header and any pending slot and heap changes
+        to disk.
+        """
+
+        self._write_header()
+        self._mapping.flush()
+        self._heap.flush()
+
+    def close(self) -> None:
+        """
+        This method flushes the map and closes its files. The map cannot be
+        used afterwards.
+        """
+
+        if self._mapping is None:
+            return
+        if self._hash_name is not None:
+            self.flush()
+        self._unmap()
+        self._file.close()
+        self._heap.close()
+        for retired in self._retired:
+            self._release(*retired)
+        self._retired = []
+
+    def _put_hashed(self, key: str, value: object, hash: int) -> None:
+        """
+        This method inserts or updates a key/value pair whose hash has already
+        been computed, as in CompactHashMap, after checking that the heap can
+        store the value.
+        :param key: The unique identifying key of the element being added.
+        :param value: The value attached to the new element.
+        :param hash: The hash of key under the map's hash function.
+        """
+
+        self._check_key(key)
+        check_storable(value)
+        super()._put_hashed(key, value, hash)
+        self._write_header()
+
+    def _remove_at(self, index: int) -> None:
+        """
+        This method removes the entry at index as in CompactHashMap and records
+        the new size in the header.
+        :param index: The index of a live slot.
+        """
+
+        super()._remove_at(index)
+        self._write_header()
+
+    def _compact(self) -> None:
+        """
+        This method rehashes the live slots into a new slot file of the same
+        capacity, which then replaces the current one.
+        """
+
+        super()._compact()
+        self._commit()
+
+    def _check_key(self, key) -> None:
+        """
+        This method checks that key can be stored in the heap.
+        :raises TypeError: If key is not a str.
+        """
+
+        if not isinstance(key, str):
+            raise TypeError(f"MmapHashMap keys must be str, not {type(key).__name__}")
+
+    def _write_header(self) -> None:
+        """
+        This method stores the capacity, size, tombstone count, hash function
+        and seed in the header of the mapped slot file, so a process that exits
+        without closing the map leaves a header that matches its slots.
+        """
+
+        seed = self._hash_seed or 0
+        HEADER.pack_into(self._mapping, 0, MAGIC, VERSION, self._capacity, self._size,
+                         self._tombstones, seed & self._HASH_MASK, seed >> 64,
+                         self._hash_name.encode('ascii'))
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        This method maps a slot file of capacity slots. When the map is opened
+        this is the file at path, sized in place unless an existing table is
+        being reopened. Later calls create a new, empty slot file next to path,
+        and keep the current one mapped so that _live_entries() can stream it
+        until _commit() replaces it.
+        :param capacity: The number of slots in the table.
+        """
+
+        if self._mapping is None:
+            if self._reopening is not None:
+                capacity = self._reopening
+            else:
+                # Truncating and extending the file zero-fills every slot.
+                self._file.truncate(HEADER_SIZE)
+        else:
+            self._retired.append((self._filePath, self._file, self._mapping, self._hashes,
+                                  self._keys._offsets, self._values._offsets, self._states))
+            directory, name = os.path.split(os.path.abspath(self._path))
+            handle, self._filePath = tempfile.mkstemp('.resize', name + '.', directory)
+            shutil.copymode(self._path, self._filePath)
+            self._file = os.fdopen(handle, 'r+b')
+        self._file.truncate(HEADER_SIZE + 25 * capacity)
+
+        self._mapping = mmap(self._file.fileno(), HEADER_SIZE + 25 * capacity)
+        view = memoryview(self._mapping)
+        columns = HEADER_SIZE, HEADER_SIZE + 8 * capacity, HEADER_SIZE + 16 * capacity
+        self._hashes = view[columns[0]:columns[1]].cast('Q')
+        self._keys = _HeapColumn(self._heap, view[columns[1]:columns[2]].cast('Q'))
+        self._values = _HeapColumn(self._heap, view[columns[2]:columns[2] + 8 * capacity].cast('Q'))
+        self._states = view[HEADER_SIZE + 24 * capacity:]
+        view.release()
+
+    def _unmap(self) -> None:
+        """
+        This method releases the views of the current mapping and closes it.
+        """
+
+        if self._mapping is None:
+            return
+        self._hashes.release()
+        self._keys._offsets.release()
+        self._values._offsets.release()
+        self._states.release()
+        self._mapping.close()
+        self._mapping = None
+
+    def _commit(self) -> None:
+        """
+        This method finishes a rebuild of the table: it writes the new slot
+        file's header and slots to disk, moves the file over path, and then
+        closes the slot files it replaced.
+        """
+
+        if not self._retired:
+            return
+        self._write_header()
+        self._mapping.flush()
+        self._heap.flush()
+        os.replace(self._filePath, self._path)
+        self._filePath = self._path
+
+        for retired in self._retired:
+            self._release(*retired)
+        self._retired = []
+
+    def _release(self, path: str, file, mapping: mmap, *views: memoryview) -> None:
+        """
+        This method closes a slot file replaced by a rebuild, removing it if it
+        was an intermediate file of nested resizes rather than the map's file.
+        """
+
+        for view in views:
+            view.release()
+        mapping.close()
+        file.close()
+        if path != self._path and os.path.exists(path):
+            os.remove(path)
+
+    def _live_entries(self):
+        """
+        This method streams the live slots of the table without reading the heap.
+        It keeps reading the current slot file after _allocate() has mapped a
+        new one, which stays possible until _commit().
+        :return: A generator of (key offset, value offset, hash) tuples.
+        """
+
+        keyOffsets, valueOffsets = self._keys._offsets, self._values._offsets
+        hashes, states = self._hashes, self._states
+        return ((keyOffsets[i], valueOffsets[i], hashes[i])
+                for i in range(self._capacity) if states[i] == FULL)
+
+    def _entry_fields(self, entry: tuple) -> tuple:
+        """
+        This method reads the key and value of an entry returned by _live_entries().
+        :return: The entry's (key, value, hash) tuple.
+        """
+
+        keyOffset, valueOffset, hash = entry
+        return self._heap.read(keyOffset), self._heap.read(valueOffset), hash
+
+    def _make_entry(self, key: str, value: object, hash: int) -> tuple:
+        """
+        This method appends a key and value to the heap for _insert_entry().
+        :return: A (key offset, value offset, hash) tuple.
+        """
+
+        return self._heap.append(key), self._heap.append(value), hash & self._HASH_MASK
+
+    def _insert_entry(self, entry: tuple) -> None:
+        """
+        This method places a (key offset, value offset, hash) tuple whose key is
+        known to be absent into the first free slot of its probe sequence. The
+        records themselves stay where they are in the heap.
+        :param entry: The (key offset, value offset, hash) tuple to be placed.
+        """
+
+        keyOffset, valueOffset, hash = entry
+        home = hash % self._capacity
+        for j in range(self._capacity):
+            index = (home + j * j) % self._capacity
+            if self._states[index] != FULL:
+                if self._states[index] != EMPTY:
+                    self._tombstones = self._tombstones - 1
+                self._keys._offsets[index] = keyOffset
+                self._values._offsets[index] = valueOffset
+                self._hashes[index] = hash
+                self._states[index] = FULL
+                return
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+
+if __name__ == "__main__":
+
+    import tempfile
+
+    print("\nMmapHashMap example")
+    print("-------------------")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'table.map')
+        with MmapHashMap(path, 11, 'fnv1a') as m:
+            for i in range(1000):
+                m.put('key' + str(i), i if i % 2 else 'value' + str(i))
+            m.remove('key3')
+            m.put('key4', b'bytes')
+            print(m.get_size(), m.get_capacity(), m.get('key1'), m.get('key2'), m.get('key4'))
+
+        with MmapHashMap(path) as m:
+            print(m.get_size(), m.get_capacity(), m.get('key999'), m.get('key3'),
+                  m.contains_key('key998'), m.empty_buckets())
+            print(os.path.getsize(path), os.path.getsize(path + '.heap'))
@@ -6,35 +6,109 @@
 #              handling.
 #              The hash_map contains the following public methods: get_size(), get_capacity,
 #              put(), resize_table(), table_load(), empty_buckets(), get(), contains_key(),
-#              remove(), get_keys_and_values(), and clear().
+#              remove(), get_keys_and_values(), clear(), and the lazy views keys(),
+#              values() and items(), which also back iteration over the map.
 #              Also included in the file is an implementation of a find_mode() function, which
 #              takes an array of values and determines the mode(s) among the elements and returns
 #              this value or values, along with the attendant frequency of occurrence.
 #              DynamicArray data structure and determines the mode of its values.
+#              find_mode_stream() does the same over any iterable, in chunks, either exactly
+#              or approximately within a fixed number of counters, and find_mode_parallel()
+#              counts shards of the input on a pool of worker processes.
 
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
 
-from a6_include import (DynamicArray, LinkedList,
-                        hash_function_1, hash_function_2)
+from a6_include import (CHAIN_POLICIES, DynamicArray, LinkedList, PRIME_CAPACITIES, SLNode,
+                        SegmentedArray, SortedBucket, TypedArray, hash_function_1,
+                        hash_function_2, hash_keys, next_prime_capacity, read_snapshot_entries,
+                        read_snapshot_header, resolve_hash_function, write_snapshot)
 
 
 class HashMap:
+    # With adaptive buckets, chains longer than _SORT_ABOVE nodes become
+    # SortedBuckets, and SortedBuckets shorter than _UNSORT_BELOW become chains.
+    _SORT_ABOVE = 8
+    _UNSORT_BELOW = 6
+
     def __init__(self,
                  capacity: int = 11,
-                 function: callable = hash_function_1) -> None:
+                 function: callable = hash_function_1,
+                 incremental: bool = False,
+                 migrate_step: int = 4,
+                 shrink_load: float = None,
+                 seed: int = None,
+                 chain_policy: str = None,
+                 adaptive_buckets: bool = False) -> None:
         """
         Initialize new HashMap that uses
-        separate chaining for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        separate chaining for collision resolution.
+        function is a hash function or the name of one in a6_include.HASH_FUNCTIONS
+        (e.g. 'fnv1a'). A seeded function such as 'siphash' uses seed, or a random
+        seed when it is None; the name and seed are kept for saving the map.
+        With incremental=True, growth triggered by put() allocates and fills the
+        new table gradually: every put/get/contains_key/remove performs at most
+        migrate_step units of work (allocating one new bucket or moving one old
+        bucket), so no single operation pays for the whole resize.
+        With shrink_load set, a remove that leaves the load factor below
+        shrink_load resizes the table to the prime capacity that brings the load
+        back to 0.5, but never below the initial capacity. Growth happens at a
+        load of 1.0, so shrink_load must lie below 0.5 to leave a gap between
+        the two thresholds and keep the map from resizing back and forth.
+        chain_policy makes the chains self-organizing: with 'move_to_front' a key
+        found by get() or contains_key() moves to the head of its chain, and with
+        'transpose' it moves one node closer, so hot keys are found sooner.
+        With adaptive_buckets=True, a bucket whose chain grows past 8 nodes is
+        turned into a SortedBucket, searched by binary search on (hash, key), and
+        turned back into a LinkedList once it falls below 6 nodes. Keys sharing
+        one full hash, such as anagrams under hash_function_1, then cost O(log n)
+        to find rather than O(n). A seeded function such as 'siphash' keeps an
+        attacker from producing such keys in the first place.
         """
-        self._buckets = DynamicArray()
+        if shrink_load is not None and not 0 < shrink_load < 0.5:
+            raise ValueError("shrink_load must lie between 0 and 0.5")
+        if chain_policy not in CHAIN_POLICIES:
+            raise ValueError(f"chain_policy must be one of {CHAIN_POLICIES}")
 
         # capacity must be a prime number
         self._capacity = self._next_prime(capacity)
-        for _ in range(self._capacity):
-            self._buckets.append(LinkedList())
+        self._buckets = SegmentedArray.from_iterable(LinkedList() for _ in range(self._capacity))
 
+        function, self._hash_name, self._hash_seed = resolve_hash_function(function, seed)
         self._hash_function = function
         self._size = 0
+        self._min_capacity = self._capacity
+        self._shrink_load = shrink_load
+        self._chain_policy = chain_policy
+        self._adaptive = adaptive_buckets
+
+        # Statistics kept up to date by every operation; see stats().
+        # _chain_counts[n] is the number of buckets of the live table holding
+        # n nodes, so _chain_counts[0] is its number of empty buckets.
+        self._chain_counts = [self._capacity]
+        self._inserts = 0
+        self._collisions = 0
+        self._resizes = 0
+        self._resize_seconds = 0.0
+        self._lookups = 0
+        self._lookup_visits = 0
+
+        # Bumped whenever a key is added or removed or a node is relinked, so
+        # the iteration views can tell that the map changed under them.
+        self._mod_count = 0
+
+        # Incremental resize state. While _next_buckets is not None the new table
+        # is still being allocated; while _old_buckets is not None its buckets
+        # from _migrate_index onward have not yet been moved into _buckets.
+        self._incremental = incremental
+        self._migrate_step = max(1, migrate_step)
+        self._next_buckets = None
+        self._next_capacity = 0
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._migrate_index = 0
 
     def __str__(self) -> str:
         """
@@ -48,36 +122,10 @@ class HashMap:
 
     def _next_prime(self, capacity: int) -> int:
         """
-        Increment from given number and the find the closest prime number
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Return the prime capacity to use for the given number, looked up in
+        the precomputed schedule of a6_include.next_prime_capacity()
         """
-        if capacity % 2 == 0:
-            capacity += 1
-
-        while not self._is_prime(capacity):
-            capacity += 2
-
-        return capacity
-
-    @staticmethod
-    def _is_prime(capacity: int) -> bool:
-        """
-        Determine if given integer is a prime number and return boolean
-        DO NOT CHANGE THIS METHOD IN ANY WAY
-        """
-        if capacity == 2 or capacity == 3:
-            return True
-
-        if capacity == 1 or capacity % 2 == 0:
-            return False
-
-        factor = 3
-        while factor ** 2 <= capacity:
-            if capacity % factor == 0:
-                return False
-            factor += 2
-
-        return True
+        return next_prime_capacity(capacity)
 
     def get_size(self) -> int:
         """
@@ -103,18 +151,59 @@ class HashMap:
         :param value: A value of an object in the hash_map.
         """
 
-        if self.table_load() >= 1.0:
-            self.resize_table(self.get_capacity() * 2)
+        self._make_room()
+        self._put_hashed(key, value, self._hash_function(key))
 
-        index = self._map_index(key)
-        bucket = self._buckets.get_at_index(index)
-        node = bucket.contains(key)
+    def put_many(self, pairs) -> None:
+        """
+        This method adds every key/value pair of an iterable to the hash_map, with
+        the same result as calling put() for each pair in order. The table is sized
+        once for the whole batch and every key is hashed in a single pass, so a bulk
+        load performs at most one resize.
+        :param pairs: An iterable of (key, value) tuples.
+        """
 
-        if node is not None:
-            node.value = value
-        else:
-            bucket.insert(key, value)
-            self._size = self._size + 1
+        pairs = list(pairs)
+        self._reserve(len(pairs))
+        self._migrate(self._migrate_step * len(pairs))
+
+        hashes = hash_keys(self._hash_function, [key for key, _ in pairs])
+        for i in range(len(pairs)):
+            key, value = pairs[i]
+            self._put_hashed(key, value, hashes[i])
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        This method looks up every key of an iterable and returns the associated
+        values in input order. Missing keys yield None, as with get().
+        :param keys: An iterable of keys.
+        :return: A DynamicArray with one value (or None) per key.
+        """
+
+        keys = list(keys)
+        self._migrate(self._migrate_step * len(keys))
+
+        hashes = hash_keys(self._hash_function, keys)
+        values = DynamicArray()
+        for i in range(len(keys)):
+            node = self._lookup_node(keys[i], hashes[i])
+            values.append(node.value if node else None)
+        return values
+
+    def remove_many(self, keys) -> None:
+        """
+        This method removes every key of an iterable from the hash_map. Keys that
+        are not present are ignored, as with remove().
+        :param keys: An iterable of keys.
+        """
+
+        keys = list(keys)
+        self._migrate(self._migrate_step * len(keys))
+
+        hashes = hash_keys(self._hash_function, keys)
+        for i in range(len(keys)):
+            self._remove_hashed(keys[i], hashes[i])
+        self._shrink_if_sparse()
 
     def resize_table(self, new_capacity: int) -> None:
         """
@@ -122,29 +211,43 @@ class HashMap:
         of the table, and executes the resizing.
         The method is responsible for maintaining the key/value pairs associated
         with the elements already in the hash_map. The new capacity must always
-        be a prime number.
-        :param new_capacity: The capacity to which the table is being resized. If
-        it is not a prime number, the method will adjust the integer value of this
-        parameter to the next prime number.
+        be a prime number. Existing nodes are relinked using their cached hashes,
+        so no key is hashed again.
+        :param new_capacity: The capacity to which the table is being resized. It is
+        rounded to the prime that next_prime_capacity() schedules for it: the next
+        prime at or above it up to 131071, the next entry of PRIME_CAPACITIES above.
         """
 
         if new_capacity < 1:
             return
-        if not self._is_prime(new_capacity):
+        # An explicit capacity of 2 is already prime and is kept as requested.
+        if new_capacity != 2:
             new_capacity = self._next_prime(new_capacity)
 
-        elements = self.get_keys_and_values()
-
-        self._buckets = DynamicArray()
-        for _ in range(new_capacity):
-            self._buckets.append(LinkedList())
+        self._finish_resize()
+        start, seconds = time.perf_counter(), self._resize_seconds
+        # The nodes are relinked straight from the old buckets, without first
+        # copying them all into a temporary array.
+        oldBuckets = self._buckets
+        self._buckets = SegmentedArray.from_iterable(LinkedList() for _ in range(new_capacity))
 
         self._capacity = new_capacity
         self._size = 0
+        self._chain_counts = [new_capacity]
+
+        for bucket in oldBuckets:
+            # Iterating a chain reads each node's link before the node is
+            # relinked, so the chain can be walked while it is taken apart.
+            for node in bucket:
+                # Grow further, as put() would, if new_capacity is too small.
+                if self._size >= self._capacity:
+                    self.resize_table(self._capacity * 2)
+                self._link_node(node)
+                self._size = self._size + 1
 
-        for i in range(elements.length()):
-            key, value = elements.get_at_index(i)
-            self.put(key, value)
+        # A nested resize has counted itself; its time is part of this one.
+        self._resizes = self._resizes + 1
+        self._resize_seconds = seconds + time.perf_counter() - start
 
     def table_load(self) -> float:
         """
@@ -159,15 +262,14 @@ class HashMap:
     def empty_buckets(self) -> int:
         """
         This method provides a tally of the number of empty buckets
-        currently present in the hash_map.
+        currently present in the hash_map. The count is kept up to date by
+        every insert and removal, so this is O(1) once any pending incremental
+        resize has been completed.
         :return: The number of empty buckets.
         """
 
-        count = 0
-        for i in range(self.get_capacity()):
-            if self._buckets.get_at_index(i).length() == 0:
-                count = count + 1
-        return count
+        self._finish_resize()
+        return self._chain_counts[0]
 
     def get(self, key: str) -> object:
         """
@@ -178,8 +280,10 @@ class HashMap:
         :return: The value if it exists, otherwise None.
         """
 
-        index = self._map_index(key)
-        node = self._buckets.get_at_index(index).contains(key)
+        if self._next_buckets is not None or self._old_buckets is not None:
+            self._migrate(self._migrate_step)
+
+        node = self._lookup_node(key, self._hash_function(key))
         return node.value if node else None
 
     def contains_key(self, key: str) -> bool:
@@ -189,7 +293,10 @@ class HashMap:
         :return: True if the key is present, otherwise False.
         """
 
-        return self._buckets.get_at_index(self._map_index(key)).contains(key) is not None
+        if self._next_buckets is not None or self._old_buckets is not None:
+            self._migrate(self._migrate_step)
+
+        return self._lookup_node(key, self._hash_function(key)) is not None
 
     def remove(self, key: str) -> None:
         """
@@ -198,8 +305,11 @@ class HashMap:
         :param key: Key to be removed from the hashmap.
         """
 
-        if self._buckets.get_at_index(self._map_index(key)).remove(key):
-            self._size -= 1
+        if self._next_buckets is not None or self._old_buckets is not None:
+            self._migrate(self._migrate_step)
+
+        self._remove_hashed(key, self._hash_function(key))
+        self._shrink_if_sparse()
 
     def get_keys_and_values(self) -> DynamicArray:
         """
@@ -210,21 +320,139 @@ class HashMap:
         """
 
         da = DynamicArray()
-        for i in range(self._buckets.length()):
-            bucket = self._buckets.get_at_index(i)
-            for node in bucket:
-                da.append((node.key, node.value))
+        for item in self.items():
+            da.append(item)
         return da
 
+    def keys(self):
+        """
+        This generator yields every key of the hash_map without copying the
+        table. See items() for the rules on changing the map meanwhile.
+        """
+
+        for node in self._iter_nodes():
+            yield node.key
+
+    def values(self):
+        """
+        This generator yields every value of the hash_map without copying the
+        table. See items() for the rules on changing the map meanwhile.
+        """
+
+        for node in self._iter_nodes():
+            yield node.value
+
+    def items(self):
+        """
+        This generator yields every (key, value) pair of the hash_map, in the
+        order of get_keys_and_values(), without copying the table. Each call
+        is an independent cursor, so views may be nested or interleaved.
+        Updating the value of an existing key and reading the map are allowed
+        while a view is open; adding or removing a key, or resizing the table,
+        makes the view raise RuntimeError on its next step.
+        """
+
+        for node in self._iter_nodes():
+            yield node.key, node.value
+
+    def __iter__(self):
+        """
+        Iterate over the (key, value) pairs of the hash_map, as items() does.
+        """
+
+        return self.items()
+
     def clear(self) -> None:
         """
         This method clears the contents of the hash map, while leaving the capacity of the
         hash map unchanged.
         """
 
+        self._next_buckets = None
+        self._old_buckets = None
         for i in range(self._buckets.length()):
             self._buckets.set_at_index(i, LinkedList())
         self._size = 0
+        self._chain_counts = [self._capacity]
+        self._mod_count += 1
+
+    def stats(self) -> dict:
+        """
+        This method reports statistics that every operation keeps up to date, so
+        sampling them is cheap and never walks the table. It only reads counters,
+        so it may be called from a monitoring thread.
+        While an incremental resize is pending, the chain lengths and empty buckets
+        describe the table that get_capacity() reports, without the nodes that
+        are still to be moved into it.
+        :return: A dict with the size, capacity and load factor; chain_lengths,
+        a list whose entry n is the number of buckets holding n nodes;
+        empty_buckets; inserts, the number of keys added, and collisions, the
+        number of them that landed in a non-empty bucket, with their ratio as
+        collision_rate; resizes and resize_seconds, the number of resizes
+        and the total time spent in them; and lookups, the number of keys looked
+        up by get(), get_many() and contains_key(), with nodes_visited, the
+        nodes they compared, and the average nodes_per_lookup.
+        """
+
+        chains = list(self._chain_counts)
+        while len(chains) > 1 and chains[-1] == 0:
+            chains.pop()
+        inserts, collisions = self._inserts, self._collisions
+        return {
+            'size': self._size,
+            'capacity': self._capacity,
+            'load': self._size / self._capacity,
+            'chain_lengths': chains,
+            'empty_buckets': chains[0],
+            'inserts': inserts,
+            'collisions': collisions,
+            'collision_rate': collisions / inserts if inserts else 0.0,
+            'resizes': self._resizes,
+            'resize_seconds': self._resize_seconds,
+            'lookups': self._lookups,
+            'nodes_visited': self._lookup_visits,
+            'nodes_per_lookup': self._lookup_visits / self._lookups if self._lookups else 0.0,
+        }
+
+    def save(self, path: str) -> None:
+        """
+        This method writes a binary snapshot of the hash_map to path: its capacity,
+        the name and seed of its hash function, and every node with its cached
+        hash, bucket by bucket. The hash function must be registered in
+        a6_include.HASH_FUNCTIONS. Keys and values may be str, bytes or Python
+        literals, as checked by a6_include.check_storable().
+        :param path: The file to be written.
+        :raises TypeError: If a key or value cannot be stored.
+        """
+
+        self._finish_resize()
+        write_snapshot(path, self._capacity, self._size, self._hash_name, self._hash_seed,
+                       self._snapshot_entries())
+
+    @classmethod
+    def load(cls, path: str, **options) -> "HashMap":
+        """
+        This method rebuilds a hash_map from a snapshot written by save(), with the
+        saved capacity, hash function and seed. The file is read in chunks and
+        every node is linked straight into its bucket using its saved hash, so no
+        key is hashed or compared and the load factor is never checked. Each
+        chain keeps its saved order.
+        :param path: The snapshot file to be read.
+        :param options: Further constructor arguments, e.g. incremental=True.
+        :return: The rebuilt HashMap.
+        """
+
+        with open(path, 'rb') as file:
+            capacity, size, name, seed = read_snapshot_header(file)
+            m = cls(capacity=capacity, function=name, seed=seed, **options)
+            if m._capacity != capacity:
+                m.resize_table(capacity)
+            for key, value, hash in read_snapshot_entries(file):
+                m._link_node(m._new_node(key, value, hash))
+                m._size = m._size + 1
+        if m._size != size:
+            raise ValueError("truncated hash map snapshot")
+        return m
 
     def _map_index(self, key):
         """
@@ -235,13 +463,344 @@ class HashMap:
 
         return self._hash_function(key) % self.get_capacity()
 
+    def _put_hashed(self, key: str, value: object, hash: int) -> None:
+        """
+        This method inserts or updates a key/value pair whose hash has already been
+        computed. It does not check the load factor.
+        :param key: The key of the element.
+        :param value: The value of the element.
+        :param hash: The hash of key under the map's hash function.
+        """
+
+        node = self._find_node(key, hash)
+
+        if node is not None:
+            node.value = value
+        else:
+            self._insert_node(key, value, hash)
+
+    def _insert_node(self, key: str, value: object, hash: int) -> SLNode:
+        """
+        This method adds a key that is known not to be present, without looking
+        it up or checking the load factor.
+        :param key: The key of the element.
+        :param value: The value of the element.
+        :param hash: The hash of key under the map's hash function.
+        :return: The new node, as created by _new_node().
+        """
+
+        index = hash % self.get_capacity()
+        bucket = self._buckets.get_at_index(index)
+        length = bucket.length()
+        node = self._new_node(key, value, hash)
+        bucket.insert_node(node)
+        self._size = self._size + 1
+        self._mod_count += 1
+        self._count_chain(length, length + 1)
+        if self._adaptive and length == self._SORT_ABOVE:
+            self._adapt_bucket(self._buckets, index)
+        self._inserts = self._inserts + 1
+        if length > 0:
+            self._collisions = self._collisions + 1
+        return node
+
+    def _iter_nodes(self):
+        """
+        This generator yields every node of the table for the iteration views,
+        completing any pending incremental resize first. Each bucket's nodes are
+        collected before they are yielded, so a chain policy reordering the chain
+        during a get() neither skips nor repeats a node.
+        :raises RuntimeError: If a key is added or removed, or the table is
+        resized, while the generator is suspended.
+        """
+
+        self._finish_resize()
+        modCount = self._mod_count
+        for bucket in self._buckets:
+            if bucket.length() == 0:
+                continue
+            for node in [node for node in bucket]:
+                yield node
+                if self._mod_count != modCount:
+                    raise RuntimeError("HashMap changed during iteration")
+
+    def _snapshot_entries(self):
+        """
+        This generator yields the (key, value, hash) of every node for save(),
+        each chain from tail to head, so that load() relinking them at the
+        front of their buckets restores the chains in their current order.
+        """
+
+        for bucket in self._buckets:
+            nodes = [node for node in bucket]
+            for node in reversed(nodes):
+                yield node.key, node.value, node.hash
+
+    def _new_node(self, key: str, value: object, hash: int) -> SLNode:
+        """
+        This method creates the node that stores a new key. Subclasses may return
+        an SLNode subclass carrying extra fields.
+        :return: A new, unlinked SLNode with its hash cached.
+        """
+
+        return SLNode(key, value, None, hash)
+
+    def _link_node(self, node) -> None:
+        """
+        This method links an existing node into its bucket of the live table.
+        :param node: The SLNode to be linked, with its hash cached.
+        """
+
+        index = node.hash % self._capacity
+        bucket = self._buckets.get_at_index(index)
+        bucket.insert_node(node)
+        self._mod_count += 1
+        self._count_chain(bucket.length() - 1, bucket.length())
+        if self._adaptive and bucket.length() == self._SORT_ABOVE + 1:
+            self._adapt_bucket(self._buckets, index)
+
+    def _count_chain(self, before: int, after: int) -> None:
+        """
+        This method records that a bucket of the live table went from holding
+        before nodes to holding after nodes.
+        """
+
+        counts = self._chain_counts
+        counts[before] = counts[before] - 1
+        if after == len(counts):
+            counts.append(0)
+        counts[after] = counts[after] + 1
+
+    def _make_room(self) -> None:
+        """
+        This method prepares the table for a write: it advances a pending
+        incremental resize, or grows the table once the load factor reaches 1.0.
+        """
+
+        if self._next_buckets is not None or self._old_buckets is not None:
+            self._migrate(self._migrate_step)
+        elif self.table_load() >= 1.0:
+            self._grow(self.get_capacity() * 2)
+
+    def _increment(self, key: str, hash: int, amount: int = 1) -> int:
+        """
+        This method adds amount to the count stored under key, inserting a count
+        of amount if the key is not present yet. Used for counting by the
+        find_mode functions.
+        :param key: The key being counted.
+        :param hash: The hash of key under the map's hash function.
+        :param amount: The number to add to the count.
+        :return: The updated count.
+        """
+
+        node = self._find_node(key, hash)
+        if node is not None:
+            node.value = node.value + amount
+            return node.value
+
+        self._make_room()
+        self._insert_node(key, amount, hash)
+        return amount
+
+    def _find_node(self, key: str, hash: int):
+        """
+        This method returns the node holding key, looking in the bucket of the
+        old table too while an incremental resize has not yet moved it.
+        :param key: The key being searched for.
+        :param hash: The hash of key under the map's hash function.
+        :return: The matching SLNode, or None if the key is not present.
+        """
+
+        if self._old_buckets is not None:
+            index = hash % self._old_capacity
+            if index >= self._migrate_index:
+                node = self._old_buckets.get_at_index(index).contains(key, hash)
+                if node is not None:
+                    return node
+
+        return self._buckets.get_at_index(hash % self.get_capacity()).contains(key, hash)
+
+    def _lookup_node(self, key: str, hash: int):
+        """
+        This method finds the node holding key, as _find_node() does, for a read
+        by the user: it applies the chain policy to the node found and counts the
+        nodes visited.
+        :param key: The key being searched for.
+        :param hash: The hash of key under the map's hash function.
+        :return: The matching SLNode, or None if the key is not present.
+        """
+
+        visited = 0
+        if self._old_buckets is not None:
+            index = hash % self._old_capacity
+            if index >= self._migrate_index:
+                node, visited = self._old_buckets.get_at_index(index).locate(key, hash, self._chain_policy)
+                if node is not None:
+                    self._lookups += 1
+                    self._lookup_visits += visited
+                    return node
+
+        bucket = self._buckets.get_at_index(hash % self._capacity)
+        node, count = bucket.locate(key, hash, self._chain_policy)
+        self._lookups += 1
+        self._lookup_visits += visited + count
+        return node
+
+    def _remove_hashed(self, key: str, hash: int) -> None:
+        """
+        This method removes key from whichever table currently holds it.
+        :param key: Key to be removed from the hashmap.
+        :param hash: The hash of key under the map's hash function.
+        """
+
+        if self._old_buckets is not None:
+            index = hash % self._old_capacity
+            if index >= self._migrate_index and self._old_buckets.get_at_index(index).remove(key, hash):
+                self._size -= 1
+                self._mod_count += 1
+                return
+
+        index = hash % self.get_capacity()
+        bucket = self._buckets.get_at_index(index)
+        if bucket.remove(key, hash):
+            self._size -= 1
+            self._mod_count += 1
+            self._count_chain(bucket.length() + 1, bucket.length())
+            if self._adaptive and bucket.length() == self._UNSORT_BELOW - 1:
+                self._adapt_bucket(self._buckets, index)
+
+    def _adapt_bucket(self, buckets: DynamicArray, index: int) -> None:
+        """
+        This method switches the bucket at index between the two representations
+        of adaptive buckets: a LinkedList longer than _SORT_ABOVE nodes becomes a
+        SortedBucket, and a SortedBucket shorter than _UNSORT_BELOW nodes becomes
+        a LinkedList. The nodes themselves are kept. A chain whose keys cannot be
+        ordered against each other stays a LinkedList.
+        :param buckets: The table holding the bucket.
+        :param index: The index of the bucket.
+        """
+
+        bucket = buckets.get_at_index(index)
+        if isinstance(bucket, LinkedList):
+            if bucket.length() > self._SORT_ABOVE:
+                try:
+                    buckets.set_at_index(index, SortedBucket(bucket))
+                except TypeError:
+                    pass
+        elif bucket.length() < self._UNSORT_BELOW:
+            chain = LinkedList()
+            for node in bucket:
+                chain.insert_node(node)
+            buckets.set_at_index(index, chain)
+
+    def _reserve(self, count: int) -> None:
+        """
+        This method grows the table once, ahead of a batch of up to count new keys,
+        to the capacity that count calls of put() with new keys would reach. It
+        steps through the same prime doublings as put(), which grows whenever the
+        load factor reaches 1.0 before an insert.
+        :param count: The number of keys about to be inserted.
+        """
+
+        needed = self._size + count
+        new_capacity = self.get_capacity()
+        while needed > new_capacity:
+            new_capacity = self._next_prime(new_capacity * 2)
+        if new_capacity != self.get_capacity():
+            self._grow(new_capacity)
+
+    def _shrink_if_sparse(self) -> None:
+        """
+        This method applies the shrink policy after a removal: once the load
+        factor falls below shrink_load, the table is resized through _grow() to
+        the prime capacity that restores a load of 0.5, but not below the
+        initial capacity.
+        """
+
+        if (self._shrink_load is None or self._capacity <= self._min_capacity
+                or self._size >= self._shrink_load * self._capacity):
+            return
+
+        new_capacity = self._next_prime(max(self._min_capacity, self._size * 2))
+        if new_capacity < self._capacity:
+            self._grow(new_capacity)
+
+    def _grow(self, new_capacity: int) -> None:
+        """
+        This method resizes the table to new_capacity (growing it, or shrinking
+        it for the shrink policy), either all at once through resize_table() or,
+        in incremental mode, by starting a gradual migration that later
+        operations carry forward through _migrate().
+        :param new_capacity: The requested capacity; it is rounded up to a prime.
+        """
+
+        if not self._incremental:
+            self.resize_table(new_capacity)
+            return
+
+        if self._next_buckets is not None or self._old_buckets is not None:
+            return
+        self._next_capacity = self._next_prime(new_capacity)
+        self._next_buckets = SegmentedArray()
+        self._resizes = self._resizes + 1
+
+    def _migrate(self, steps: int) -> None:
+        """
+        This method advances a pending incremental resize by up to steps units of
+        work. The new table is first allocated one bucket per unit, while the old
+        table keeps serving every operation. Once it is complete it becomes the
+        live table and the old buckets are then moved into it one per unit.
+        :param steps: The maximum number of buckets to allocate or move.
+        """
+
+        if self._next_buckets is None and self._old_buckets is None:
+            return
+
+        start = time.perf_counter()
+        while steps > 0 and self._next_buckets is not None:
+            self._next_buckets.append(LinkedList())
+            steps -= 1
+            if self._next_buckets.length() == self._next_capacity:
+                self._old_buckets, self._old_capacity = self._buckets, self._capacity
+                self._buckets, self._capacity = self._next_buckets, self._next_capacity
+                self._next_buckets = None
+                self._migrate_index = 0
+                self._chain_counts = [self._capacity]
+
+        # A shrink leaves a much larger, mostly empty old table behind. Its buckets
+        # are moved proportionally faster, so the migration still completes in
+        # about as many operations as the new table has buckets.
+        if self._old_buckets is not None:
+            steps = steps * max(1, self._old_capacity // self._capacity)
+
+        while steps > 0 and self._old_buckets is not None:
+            for node in self._old_buckets.get_at_index(self._migrate_index):
+                self._link_node(node)
+            self._old_buckets.set_at_index(self._migrate_index, None)
+            self._migrate_index += 1
+            steps -= 1
+            if self._migrate_index == self._old_capacity:
+                self._old_buckets = None
+
+        self._resize_seconds = self._resize_seconds + time.perf_counter() - start
+
+    def _finish_resize(self) -> None:
+        """
+        This method completes any pending incremental resize at once. It is used
+        by operations that walk the whole table anyway.
+        """
+
+        while self._next_buckets is not None or self._old_buckets is not None:
+            self._migrate(self._next_capacity + self._old_capacity)
+
+
 def find_mode(da: DynamicArray) -> tuple[DynamicArray, int]:
     """
     This function takes a DynamicArray and finds the mode among the values
     of the elements in the array. It returns a DynamicArray with the mode
     value(s) and an integer with the integer value of the number of occurrences
     of the mode.
-    :param da: A DynamicArray with values.
+    :param da: A DynamicArray, TypedArray or SegmentedArray with values.
     :return: A tuple containing a DynamicArray containing the mode value(s) and
     an integer representing the number of occurrences of the value.
     """
@@ -249,8 +808,14 @@ def find_mode(da: DynamicArray) -> tuple[DynamicArray, int]:
     map = HashMap()
     frequency = 0
 
-    for i in range(da.length()):
-        val = da.get_at_index(i)
+    # A TypedArray or SegmentedArray is iterated natively rather than through
+    # get_at_index().
+    if isinstance(da, (TypedArray, SegmentedArray)):
+        values = da
+    else:
+        values = (da.get_at_index(i) for i in range(da.length()))
+
+    for val in values:
         current = map.get(val)
 
         # On first pass for a given key, initialize its count to 1.
@@ -267,14 +832,205 @@ def find_mode(da: DynamicArray) -> tuple[DynamicArray, int]:
 
     # Find the mode(s) and store the mode(s) in a DynamicArray.
     modes = DynamicArray()
-    keyVal = map.get_keys_and_values()
-    for i in range(keyVal.length()):
-        if keyVal.get_at_index(i)[1] == frequency:
-            modes.append(keyVal.get_at_index(i)[0])
+    for key, count in map.items():
+        if count == frequency:
+            modes.append(key)
 
     return modes, frequency
 
 
+def find_mode_stream(values, counters: int = None,
+                     chunk_size: int = 4096) -> tuple[DynamicArray, int, int]:
+    """
+    This function finds the mode of any iterable, including generators, reading it
+    chunk_size values at a time and hashing each chunk in one batch.
+    With counters=None the count is exact and uses one HashMap entry per distinct
+    value. With counters=k, the Misra-Gries algorithm keeps at most k counts, so
+    memory stays flat however long the stream is. Whenever a new value arrives and
+    all k counters are taken, every counter is decremented instead. Each count is
+    then an underestimate by at most the number of such decrement rounds, which
+    is itself at most n / (k + 1) for a stream of n values.
+    :param values: An iterable of values.
+    :param counters: The number of counters to keep, or None for an exact count.
+    :param chunk_size: The number of values read and hashed at a time.
+    :return: A tuple (candidates, frequency, error). In exact mode, candidates are
+    the modes, frequency is their count and error is 0. In approximate mode, the
+    mode's true frequency lies between frequency and frequency + error, and every
+    value that may be the mode is among the candidates as long as the mode occurs
+    more than error times.
+    """
+
+    counts = HashMap()
+    error = 0
+    iterator = iter(values)
+
+    chunk = list(islice(iterator, chunk_size))
+    while chunk:
+        hashes = hash_keys(counts._hash_function, chunk)
+        for i in range(len(chunk)):
+            if counters is None or counts.get_size() < counters:
+                counts._increment(chunk[i], hashes[i])
+                continue
+
+            node = counts._find_node(chunk[i], hashes[i])
+            if node is not None:
+                node.value = node.value + 1
+                continue
+
+            # All counters are taken by other values: decrement every one of them.
+            error = error + 1
+            pairs = counts.get_keys_and_values()
+            for j in range(pairs.length()):
+                key, count = pairs.get_at_index(j)
+                if count == 1:
+                    counts.remove(key)
+                else:
+                    counts.put(key, count - 1)
+
+        chunk = list(islice(iterator, chunk_size))
+
+    frequency = max(counts.values(), default=0)
+
+    candidates = DynamicArray()
+    for key, count in counts.items():
+        if count + error >= frequency and frequency > 0:
+            candidates.append(key)
+
+    return candidates, frequency, error
+
+
+def find_mode_parallel(values, workers: int = None,
+                       chunk_size: int = 100000) -> tuple[DynamicArray, int]:
+    """
+    This function finds the mode(s) of a DynamicArray or any iterable using a pool
+    of worker processes, and returns the same modes and frequency as find_mode().
+    The input is cut into shards of chunk_size values. Each worker counts a shard
+    into one HashMap per hash partition. A value always falls into the same
+    partition, so partitions are merged independently, also on the pool: whenever
+    a partition has collected several partial counts they are folded into one,
+    so the parent holds at most a few partial lists per partition, plus one
+    merged list, however long the input is. The modes are returned in partition
+    order rather than find_mode()'s bucket order.
+    :param values: A DynamicArray or iterable of string values.
+    :param workers: The number of worker processes (default: the CPU count).
+    :param chunk_size: The number of values counted per task.
+    :return: A tuple containing a DynamicArray of the mode value(s) and their frequency.
+    """
+
+    workers = workers or os.cpu_count() or 1
+    if isinstance(values, DynamicArray):
+        da = values
+        values = (da.get_at_index(i) for i in range(da.length()))
+    iterator = iter(values)
+
+    # Partial count lists collected per partition, and the folds in flight.
+    fold = 4
+    partials = [[] for _ in range(workers)]
+    folding = {}
+    with ProcessPoolExecutor(workers) as pool:
+        # Keep a bounded number of shards in flight so the input is streamed, and
+        # stop reading while any partition is waiting on a fold of its backlog.
+        counting = set()
+        chunk = list(islice(iterator, chunk_size))
+        while chunk or counting or folding:
+            while (chunk and len(counting) < 2 * workers
+                   and max(len(lists) for lists in partials) < 2 * fold):
+                counting.add(pool.submit(_count_shard, chunk, workers))
+                chunk = list(islice(iterator, chunk_size))
+
+            done, _ = wait(counting | set(folding), return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in folding:
+                    partials[folding.pop(future)].append(future.result())
+                else:
+                    counting.discard(future)
+                    shard = future.result()
+                    for p in range(workers):
+                        partials[p].append(shard[p])
+
+            busy = set(folding.values())
+            for p in range(workers):
+                if p not in busy and len(partials[p]) >= fold:
+                    folding[pool.submit(_fold_partition, partials[p])] = p
+                    partials[p] = []
+
+        results = list(pool.map(_merge_partition, partials))
+
+    frequency = max(result[0] for result in results)
+    modes = DynamicArray()
+    for partFrequency, partModes in results:
+        if partFrequency == frequency and frequency > 0:
+            for value in partModes:
+                modes.append(value)
+
+    return modes, frequency
+
+
+def _count_shard(values: list, partitions: int) -> list:
+    """
+    This function counts one shard of values for find_mode_parallel(), routing
+    each value to the HashMap of its hash partition.
+    :param values: A list of string values.
+    :param partitions: The number of hash partitions.
+    :return: For every partition, a list of (value, count) tuples.
+    """
+
+    maps = [HashMap(11, hash_function_1) for _ in range(partitions)]
+    hashes = hash_keys(hash_function_1, values)
+    for i in range(len(values)):
+        maps[hashes[i] % partitions]._increment(values[i], hashes[i])
+
+    shard = []
+    for m in maps:
+        shard.append(list(m.items()))
+    return shard
+
+
+def _sum_partition(partials: list) -> HashMap:
+    """
+    This function adds up the partial counts of one hash partition.
+    :param partials: A list of lists of (value, count) tuples.
+    :return: A HashMap of every value to its total count.
+    """
+
+    counts = HashMap(11, hash_function_1)
+    for pairs in partials:
+        hashes = hash_keys(hash_function_1, [value for value, _ in pairs])
+        for i in range(len(pairs)):
+            value, count = pairs[i]
+            counts._increment(value, hashes[i], count)
+    return counts
+
+
+def _fold_partition(partials: list) -> list:
+    """
+    This function folds several partial counts of one hash partition into one
+    for find_mode_parallel().
+    :param partials: A list of lists of (value, count) tuples.
+    :return: A single list of (value, count) tuples.
+    """
+
+    return list(_sum_partition(partials).items())
+
+
+def _merge_partition(partials: list) -> tuple[int, list]:
+    """
+    This function merges the partial counts of one hash partition for
+    find_mode_parallel() and finds the partition's most frequent values.
+    :param partials: A list of lists of (value, count) tuples.
+    :return: A tuple of the highest frequency and the list of values having it.
+    """
+
+    frequency = 0
+    modes = []
+    for value, count in _sum_partition(partials).items():
+        if count > frequency:
+            frequency, modes = count, [value]
+        elif count == frequency:
+            modes.append(value)
+    return frequency, modes
+
+
 # ------------------- BASIC TESTING ---------------------------------------- #
 
 
@@ -476,3 +1232,205 @@ if __name__ == "__main__":
         da = DynamicArray(case)
         mode, frequency = find_mode(da)
         print(f"Input: {da}\nMode : {mode}, Frequency: {frequency}\n")
+
+    print("\nput_many / get_many / remove_many example")
+    print("-----------------------------------------")
+    m = HashMap(11, hash_function_1)
+    m.put_many(('key' + str(i), i) for i in range(1000))
+    print(m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+    print(m.get_many(['key0', 'key500', 'missing', 'key999']))
+    m.remove_many('key' + str(i) for i in range(0, 1000, 2))
+    print(m.get_size(), m.get_many(['key0', 'key1']))
+
+    print("\nincremental resize example")
+    print("--------------------------")
+    m = HashMap(11, hash_function_2, incremental=True)
+    for i in range(100):
+        m.put('key' + str(i), i)
+        if i % 20 == 19:
+            print(m.get_size(), m.get_capacity(), m.get('key0'), m.get('key' + str(i)))
+    print(m.empty_buckets(), m.get_size(), m.get_capacity())
+
+    print("\nfind_mode_stream example")
+    print("------------------------")
+    case = ["2", "4", "2", "6", "8", "4", "1", "3", "4", "5", "7", "3", "3", "2"]
+    mode, frequency, error = find_mode_stream(iter(case), chunk_size=4)
+    print(f"Exact : {mode}, Frequency: {frequency}, Error: {error}")
+    stream = (str(i % 7) if i % 3 else "0" for i in range(10000))
+    mode, frequency, error = find_mode_stream(stream, counters=3)
+    print(f"Approx: {mode}, Frequency: {frequency}..{frequency + error}")
+
+    print("\nfind_mode_parallel example")
+    print("--------------------------")
+    da = DynamicArray(["Arch", "Manjaro", "Manjaro", "Mint", "Mint", "Mint", "Ubuntu", "Ubuntu", "Ubuntu"])
+    mode, frequency = find_mode_parallel(da, workers=2, chunk_size=4)
+    print(f"Input: {da}\nMode : {mode}, Frequency: {frequency}")
+
+    print("\nprime capacity schedule example")
+    print("-------------------------------")
+    def trial_division_next_prime(capacity):
+        # The trial-division search that _next_prime() used before the schedule.
+        capacity = max(capacity | 1, 3)
+        while any(capacity % factor == 0 for factor in range(3, int(capacity ** 0.5) + 1, 2)):
+            capacity += 2
+        return capacity
+
+    def is_probable_prime(n):
+        # Miller-Rabin with these bases is exact for every n below 3.3 * 10 ** 24.
+        d, r = n - 1, 0
+        while d % 2 == 0:
+            d, r = d // 2, r + 1
+        for base in (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37):
+            x = pow(base, d, n)
+            if x in (1, n - 1):
+                continue
+            for _ in range(r - 1):
+                x = x * x % n
+                if x == n - 1:
+                    break
+            else:
+                return False
+        return True
+
+    print(all(next_prime_capacity(n) == trial_division_next_prime(n)
+              for n in list(range(0, 5000)) + list(range(130000, 131072))))
+    print(all(is_probable_prime(p) for p in PRIME_CAPACITIES))
+    print(all(next_prime_capacity(2 * PRIME_CAPACITIES[i]) == PRIME_CAPACITIES[i + 1]
+              for i in range(len(PRIME_CAPACITIES) - 1)))
+    m = HashMap(11, hash_function_2)
+    m.resize_table(200003)
+    print(m.get_capacity())
+
+    print("\nSLNode memory example")
+    print("---------------------")
+    import tracemalloc
+    def bytes_per_node(factory, count=10000):
+        tracemalloc.start()
+        start, _ = tracemalloc.get_traced_memory()
+        nodes = [factory() for _ in range(count)]
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return (current - start) / count
+
+    # The same node without __slots__, for comparison.
+    DictNode = type('DictNode', (), {'__init__': SLNode.__init__})
+    slotted = bytes_per_node(lambda: SLNode(None, None, None, 0))
+    baseline = bytes_per_node(lambda: DictNode(None, None, None, 0))
+    print(hasattr(SLNode('key', 1, None, 1), '__dict__'), slotted < baseline)
+    print(f"bytes per node: {round(slotted)} (with __dict__: {round(baseline)})")
+
+    print("\nshrink_load example")
+    print("-------------------")
+    m = HashMap(11, hash_function_2, shrink_load=0.2)
+    for cycle in range(2):
+        for i in range(1000):
+            m.put('key' + str(i), i)
+        print(m.get_size(), m.get_capacity())
+        for i in range(990):
+            m.remove('key' + str(i))
+        print(m.get_size(), m.get_capacity(), m.get('key995'))
+
+    print("\nstats example")
+    print("-------------")
+    for function in (hash_function_1, hash_function_2):
+        m = HashMap(11, function)
+        for i in range(500):
+            m.put('key' + str(i), i)
+        stats = m.stats()
+        print(function.__name__, stats['capacity'], stats['empty_buckets'], stats['resizes'],
+              len(stats['chain_lengths']) - 1, round(stats['collision_rate'], 2))
+
+    print("\nhash function registry example")
+    print("------------------------------")
+    anagrams = ['listen', 'silent', 'enlist', 'tinsel', 'inlets', 'key12', 'key21']
+    for name in ('hash_function_1', 'fnv1a', 'multiplicative', 'siphash'):
+        m = HashMap(11, name, seed=42 if name == 'siphash' else None)
+        for key in anagrams:
+            m.put(key, len(key))
+        print(name, m.get_capacity(), len(m.stats()['chain_lengths']) - 1, m.get('tinsel'))
+
+    print("\nsave / load example")
+    print("-------------------")
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'map.snapshot')
+        m = HashMap(11, 'siphash', incremental=True)
+        for i in range(1000):
+            m.put('key' + str(i), i if i % 3 else ('value', i))
+        m.save(path)
+        loaded = HashMap.load(path)
+        pairs, loadedPairs = m.get_keys_and_values(), loaded.get_keys_and_values()
+        print(loaded.get_size(), loaded.get_capacity(), loaded.get('key3'), loaded.get('key4'),
+              str(pairs) == str(loadedPairs), loaded._hash_seed == m._hash_seed)
+
+    print("\nself-organizing chains example")
+    print("------------------------------")
+    import random
+    keys = ['key' + str(i) for i in range(2000)]
+    # Zipfian lookups, with popularity unrelated to the order of insertion.
+    popular = keys.copy()
+    random.Random(1).shuffle(popular)
+    lookups = random.Random(0).choices(popular, weights=[1 / (i + 1) for i in range(2000)], k=20000)
+    for policy in CHAIN_POLICIES:
+        m = HashMap(11, hash_function_1, chain_policy=policy)
+        for key in keys:
+            m.put(key, key)
+        for key in lookups:
+            m.get(key)
+        stats = m.stats()
+        print(policy, m.get_capacity(), stats['lookups'], round(stats['nodes_per_lookup'], 1))
+
+    print("\nadaptive buckets example")
+    print("------------------------")
+    from itertools import permutations
+    # Anagrams all share one full hash under hash_function_1.
+    anagrams = [''.join(letters) for letters in permutations('abcdefg')][:1000]
+    for name, adaptive in (('hash_function_1', False), ('hash_function_1', True), ('siphash', False)):
+        m = HashMap(11, name, seed=7 if name == 'siphash' else None, adaptive_buckets=adaptive)
+        for key in anagrams:
+            m.put(key, key)
+        for key in anagrams:
+            m.get(key)
+        stats = m.stats()
+        bucket = m._buckets.get_at_index(m._map_index(anagrams[0]))
+        print(name, adaptive, m.get_capacity(), len(stats['chain_lengths']) - 1,
+              round(stats['nodes_per_lookup'], 1), type(bucket).__name__)
+
+    print("\niteration views example")
+    print("-----------------------")
+    m = HashMap(11, hash_function_2)
+    for i in range(1, 6):
+        m.put(str(i), i * 10)
+    print(list(m.keys()), sum(m.values()), list(m) == list(m.items()))
+    pairs = [(first, second) for first in m.keys() for second in m.keys() if first < second]
+    for key, value in m.items():
+        m.put(key, value + 1)
+    print(len(pairs), list(m.values()))
+    try:
+        for key in m.keys():
+            m.remove(key)
+    except RuntimeError as error:
+        print(type(error).__name__, error, m.get_size())
+
+    print("\nTypedArray example")
+    print("------------------")
+    arr = TypedArray('q', capacity=4)
+    arr.extend(range(10))
+    arr.append(3)
+    view = arr[::3]
+    print(arr, arr.get_capacity(), view, list(view.memoryview()), sum(arr))
+    mode, frequency = find_mode(TypedArray.from_iterable(['b', 'a', 'b', 'c', 'a', 'b']))
+    print(mode, frequency)
+
+    print("\nSegmentedArray example")
+    print("----------------------")
+    arr = SegmentedArray(chunk_size=1024)
+    arr.extend(range(3000))
+    first = arr._chunks[0]
+    arr.extend(range(3000, 10000))
+    print(arr.length(), arr.get_capacity(), arr.chunk_count(), arr._chunks[0] is first,
+          arr.get_at_index(9999), sum(arr))
+    m = HashMap(11, 'fnv1a')
+    for i in range(5000):
+        m.put('key' + str(i), i)
+    print(m.get_capacity(), type(m._buckets).__name__, m._buckets.chunk_count(), m.get('key4999'))